@@ -0,0 +1,407 @@
+"""Numba-compiled numeric kernels for the analytics hot path.
+
+Kernels carry explicit type signatures so they are compiled eagerly at
+import time rather than lazily on the user's first interaction, and
+cache=True persists the compiled code across app restarts. Set
+NUMBA_CACHE_DIR to a writable path if the default (next to this file)
+is not suitable, e.g. when Streamlit reloads from a read-only install.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("Warning: numba not installed. Falling back to pandas rolling ops.")
+    print("Install it using: pip install numba")
+
+    def njit(*args, **kwargs):
+        """No-op decorator used when numba is unavailable"""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(["float32[:](float32[:], int64)",
+       "float64[:](float64[:], int64)"], cache=True, fastmath=True, nogil=True)
+def rolling_zscore(x, w):
+    """
+    Single-pass rolling z-score.
+
+    Maintains a running sum and sum-of-squares over the window, adding the
+    incoming value and subtracting the outgoing one, so the whole series is
+    covered in one pass with no intermediate arrays.
+
+    Args:
+        x: float32 or float64 array
+        w: window length
+
+    Returns:
+        array (same dtype as input) with the first w-1 entries NaN
+    """
+    n = x.shape[0]
+    out = np.empty_like(x)
+    s = 0.0
+    s2 = 0.0
+    for i in range(n):
+        v = x[i]
+        s += v
+        s2 += v * v
+        if i >= w:
+            old = x[i - w]
+            s -= old
+            s2 -= old * old
+        if i >= w - 1:
+            mean = s / w
+            var = (s2 - s * s / w) / (w - 1)
+            if var > 0.0:
+                out[i] = (v - mean) / np.sqrt(var)
+            else:
+                out[i] = np.nan
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(["float32[:](float32[:], float32[:], int64)",
+       "float64[:](float64[:], float64[:], int64)"], cache=True, fastmath=True, nogil=True)
+def rolling_corr(a, b, w):
+    """
+    Single-pass rolling Pearson correlation.
+
+    Maintains running Σa, Σb, Σa², Σb², Σab over the window, adding the
+    incoming pair and subtracting the outgoing one, so correlation comes
+    out of one pass with no intermediate Series.
+
+    Args:
+        a: float32 or float64 array
+        b: float array (same length as a)
+        w: window length
+
+    Returns:
+        array (same dtype as input) with the first w-1 entries NaN
+    """
+    n = a.shape[0]
+    out = np.empty_like(a)
+    sa = 0.0
+    sb = 0.0
+    saa = 0.0
+    sbb = 0.0
+    sab = 0.0
+    for i in range(n):
+        x = a[i]
+        y = b[i]
+        sa += x
+        sb += y
+        saa += x * x
+        sbb += y * y
+        sab += x * y
+        if i >= w:
+            ox = a[i - w]
+            oy = b[i - w]
+            sa -= ox
+            sb -= oy
+            saa -= ox * ox
+            sbb -= oy * oy
+            sab -= ox * oy
+        if i >= w - 1:
+            var_a = w * saa - sa * sa
+            var_b = w * sbb - sb * sb
+            denom = var_a * var_b
+            if denom > 0.0:
+                out[i] = (w * sab - sa * sb) / np.sqrt(denom)
+            else:
+                out[i] = np.nan
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(["UniTuple(float64, 3)(float32[:], float32[:])",
+       "UniTuple(float64, 3)(float64[:], float64[:])"], cache=True, fastmath=True, nogil=True)
+def ols_beta_alpha_r2(y, x):
+    """
+    Single-pass univariate OLS of y on x (with intercept).
+
+    Accumulates Σx, Σy, Σx², Σy², Σxy in one loop; beta, alpha and R²
+    all come out of those five sums, so no residual array is built.
+
+    Args:
+        y: dependent variable (float32 or float64 array)
+        x: regressor (same dtype and length as y)
+
+    Returns:
+        tuple: (beta, alpha, r_squared); beta is NaN when x has zero
+        variance so callers can detect the degenerate case
+    """
+    n = y.shape[0]
+    sx = 0.0
+    sy = 0.0
+    sxx = 0.0
+    syy = 0.0
+    sxy = 0.0
+    for i in range(n):
+        xi = x[i]
+        yi = y[i]
+        sx += xi
+        sy += yi
+        sxx += xi * xi
+        syy += yi * yi
+        sxy += xi * yi
+    var_x = n * sxx - sx * sx
+    if var_x <= 0.0:
+        return np.nan, 0.0, 0.0
+    beta = (n * sxy - sx * sy) / var_x
+    alpha = (sy - beta * sx) / n
+    var_y = n * syy - sy * sy
+    if var_y <= 0.0:
+        return beta, alpha, 0.0
+    r = (n * sxy - sx * sy) / np.sqrt(var_x * var_y)
+    return beta, alpha, r * r
+
+
+@njit("Tuple((float64, int64))(float64[:], int64)", cache=True, nogil=True)
+def adf_tstat(y, maxlag):
+    """
+    t-statistic of the fixed-lag augmented Dickey-Fuller regression.
+
+    Builds the design matrix [y_{t-1}, const, dy_{t-1}..dy_{t-maxlag}]
+    and solves the least-squares problem entirely inside the kernel, so
+    the Python side only has to map the statistic through the MacKinnon
+    tables.
+
+    Args:
+        y: float64 array (no NaNs)
+        maxlag: number of lagged differences in the regression
+
+    Returns:
+        tuple: (t-statistic, effective nobs); the statistic is NaN when
+        the design matrix is rank-deficient
+    """
+    n = y.shape[0]
+    nobs = n - 1 - maxlag
+    k = 2 + maxlag
+    dy = np.empty(n - 1, dtype=np.float64)
+    for i in range(n - 1):
+        dy[i] = y[i + 1] - y[i]
+    X = np.empty((nobs, k), dtype=np.float64)
+    target = np.empty(nobs, dtype=np.float64)
+    for i in range(nobs):
+        X[i, 0] = y[maxlag + i]
+        X[i, 1] = 1.0
+        for j in range(1, maxlag + 1):
+            X[i, 1 + j] = dy[maxlag + i - j]
+        target[i] = dy[maxlag + i]
+    beta, _, rank, _ = np.linalg.lstsq(X, target)
+    if rank < k:
+        return np.nan, nobs
+    resid = target - X @ beta
+    sigma2 = np.dot(resid, resid) / (nobs - k)
+    se = np.sqrt(sigma2 * np.linalg.inv(X.T @ X)[0, 0])
+    return beta[0] / se, nobs
+
+
+@njit(["Tuple((float32[:], float32[:]))(float32[:], float32[:], float64, int64)",
+       "Tuple((float64[:], float64[:]))(float64[:], float64[:], float64, int64)"],
+      cache=True, fastmath=True, nogil=True)
+def fused_spread_z(a, b, beta, w):
+    """
+    Fused spread + rolling z-score computation.
+
+    Computes s[i] = a[i] - beta*b[i] and its rolling z-score in a single
+    loop, so the refresh path reads the price arrays once instead of
+    making separate passes for spread, rolling mean and rolling std.
+
+    Args:
+        a: float array of prices for asset A
+        b: float array of prices for asset B (same length)
+        beta: hedge ratio
+        w: rolling window length
+
+    Returns:
+        tuple: (spread array, z-score array with first w-1 entries NaN)
+    """
+    n = a.shape[0]
+    spread = np.empty_like(a)
+    z = np.empty_like(a)
+    s = 0.0
+    s2 = 0.0
+    for i in range(n):
+        v = a[i] - beta * b[i]
+        spread[i] = v
+        s += v
+        s2 += v * v
+        if i >= w:
+            old = spread[i - w]
+            s -= old
+            s2 -= old * old
+        if i >= w - 1:
+            mean = s / w
+            var = (s2 - s * s / w) / (w - 1)
+            if var > 0.0:
+                z[i] = (v - mean) / np.sqrt(var)
+            else:
+                z[i] = np.nan
+        else:
+            z[i] = np.nan
+    return spread, z
+
+
+# Window-specialized variants of the rolling kernels. The slider value
+# rarely changes, so closing over the window turns it into a
+# compile-time constant - LLVM can then unroll and vectorize the
+# window-relative indexing instead of treating w as a runtime value.
+_WINDOW_KERNEL_CACHE = {}
+
+
+def rolling_zscore_for(w):
+    """Return a rolling z-score kernel specialized for one window"""
+    key = ('zscore', w)
+    kernel = _WINDOW_KERNEL_CACHE.get(key)
+    if kernel is not None:
+        return kernel
+
+    win = np.int64(w)
+
+    @njit(fastmath=True, nogil=True)
+    def zscore_w(x):
+        n = x.shape[0]
+        out = np.empty_like(x)
+        s = 0.0
+        s2 = 0.0
+        for i in range(n):
+            v = x[i]
+            s += v
+            s2 += v * v
+            if i >= win:
+                old = x[i - win]
+                s -= old
+                s2 -= old * old
+            if i >= win - 1:
+                mean = s / win
+                var = (s2 - s * s / win) / (win - 1)
+                if var > 0.0:
+                    out[i] = (v - mean) / np.sqrt(var)
+                else:
+                    out[i] = np.nan
+            else:
+                out[i] = np.nan
+        return out
+
+    _WINDOW_KERNEL_CACHE[key] = zscore_w
+    return zscore_w
+
+
+def fused_spread_z_for(w):
+    """Return a fused spread/z-score kernel specialized for one window"""
+    key = ('spread_z', w)
+    kernel = _WINDOW_KERNEL_CACHE.get(key)
+    if kernel is not None:
+        return kernel
+
+    win = np.int64(w)
+
+    @njit(fastmath=True, nogil=True)
+    def spread_z_w(a, b, beta):
+        n = a.shape[0]
+        spread = np.empty_like(a)
+        z = np.empty_like(a)
+        s = 0.0
+        s2 = 0.0
+        for i in range(n):
+            v = a[i] - beta * b[i]
+            spread[i] = v
+            s += v
+            s2 += v * v
+            if i >= win:
+                old = spread[i - win]
+                s -= old
+                s2 -= old * old
+            if i >= win - 1:
+                mean = s / win
+                var = (s2 - s * s / win) / (win - 1)
+                if var > 0.0:
+                    z[i] = (v - mean) / np.sqrt(var)
+                else:
+                    z[i] = np.nan
+            else:
+                z[i] = np.nan
+        return spread, z
+
+    _WINDOW_KERNEL_CACHE[key] = spread_z_w
+    return spread_z_w
+
+
+# One specialized OHLC-reduce kernel per bar width. Closing over bar_ns
+# bakes it in as a compile-time constant, letting LLVM strength-reduce
+# the floor division to a multiply-shift; the app only ever uses a
+# handful of timeframes so the cache stays tiny.
+_OHLC_REDUCE_CACHE = {}
+
+
+def ohlc_reduce_for(bar_ns):
+    """Return an OHLCV bucket-reduce kernel specialized for one bar width"""
+    kernel = _OHLC_REDUCE_CACHE.get(bar_ns)
+    if kernel is not None:
+        return kernel
+
+    bar = np.int64(bar_ns)
+
+    @njit(fastmath=True, nogil=True)
+    def ohlc_reduce(ts_ns, price, qty):
+        n = ts_ns.shape[0]
+        # First pass: count buckets
+        nb = 1
+        prev = ts_ns[0] // bar
+        for i in range(1, n):
+            b = ts_ns[i] // bar
+            if b != prev:
+                nb += 1
+                prev = b
+        bucket_ids = np.empty(nb, dtype=np.int64)
+        o = np.empty(nb, dtype=np.float64)
+        h = np.empty(nb, dtype=np.float64)
+        l = np.empty(nb, dtype=np.float64)
+        c = np.empty(nb, dtype=np.float64)
+        v = np.empty(nb, dtype=np.float64)
+        # Second pass: fill OHLCV per bucket
+        j = -1
+        prev = -1
+        for i in range(n):
+            b = ts_ns[i] // bar
+            p = price[i]
+            if b != prev:
+                j += 1
+                bucket_ids[j] = b
+                o[j] = p
+                h[j] = p
+                l[j] = p
+                v[j] = qty[i]
+                prev = b
+            else:
+                if p > h[j]:
+                    h[j] = p
+                if p < l[j]:
+                    l[j] = p
+                v[j] += qty[i]
+            c[j] = p
+        return bucket_ids, o, h, l, c, v
+
+    _OHLC_REDUCE_CACHE[bar_ns] = ohlc_reduce
+    return ohlc_reduce
+
+
+if NUMBA_AVAILABLE:
+    # Warm the dispatcher at import time so the first user interaction
+    # does not pay the (cached) compile/load cost
+    _warm = np.zeros(4, dtype=np.float64)
+    rolling_zscore(_warm, 2)
+    rolling_corr(_warm, _warm, 2)
+    fused_spread_z(_warm, _warm, 1.0, 2)
+    ols_beta_alpha_r2(_warm, _warm)
+    adf_tstat(np.arange(12, dtype=np.float64), 1)
+    del _warm
@@ -1,57 +1,473 @@
 import numpy as np
 import pandas as pd
+from collections import OrderedDict
+from _kernels import (
+    NUMBA_AVAILABLE,
+    rolling_zscore_for,
+    rolling_corr,
+    fused_spread_z_for,
+    ols_beta_alpha_r2,
+    adf_tstat,
+    ohlc_reduce_for,
+)
+try:
+    import xxhash
+
+    def _hash_bytes(data):
+        return xxhash.xxh64(data).intdigest()
+except ImportError:
+    import zlib
+
+    def _hash_bytes(data):
+        return zlib.crc32(data)
 try:
     from statsmodels.tsa.stattools import adfuller
+    from statsmodels.tsa.adfvalues import mackinnonp, mackinnoncrit
     import statsmodels.api as sm
     STATSMODELS_AVAILABLE = True
 except ImportError:
     STATSMODELS_AVAILABLE = False
     print("Warning: statsmodels not installed. ADF test will not be available.")
     print("Install it using: pip install statsmodels")
+try:
+    from scipy import linalg as scipy_linalg
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+
+# Shared empty singletons returned on early exits: even an empty Series
+# or DataFrame allocation is non-trivial and the hot path can hit these
+# every refresh
+_EMPTY_SERIES = pd.Series(dtype=np.float64)
+_EMPTY_DF = pd.DataFrame()
+
+
+def _as_float(values):
+    """Return values as a float array, preserving float32 inputs"""
+    values = np.asarray(values)
+    if values.dtype == np.float32 or values.dtype == np.float64:
+        return values
+    return values.astype(np.float64)
+
+
+def _align_pair(a, b):
+    """
+    Align two Series and drop non-finite pairs.
+
+    Returns:
+        tuple: (a values, b values, shared index) as numpy arrays plus the
+        surviving pd.Index - no intermediate DataFrame is built.
+    """
+    a, b = a.align(b, join="inner")
+    va = _as_float(a.to_numpy())
+    vb = _as_float(b.to_numpy())
+    if va.dtype != vb.dtype:
+        va = va.astype(np.float64)
+        vb = vb.astype(np.float64)
+    mask = np.isfinite(va) & np.isfinite(vb)
+    if mask.all():
+        return va, vb, a.index
+    return va[mask], vb[mask], a.index[mask]
+
+
+class RollingPairState:
+    """
+    Incremental rolling z-score / correlation state for one symbol pair.
+
+    Maintains running sums over the trailing window (deque-backed) so a
+    refresh that adds one or two new bars costs O(new bars) instead of
+    re-running the rolling kernels over the whole series. Only closed
+    bars are committed to the state; the still-open bar - whose close
+    mutates as ticks arrive - is evaluated provisionally on every call.
+
+    The state re-seeds itself from scratch when the hedge ratio drifts
+    more than 0.1% (the committed spread history would no longer match)
+    or when timestamps go backwards.
+    """
+
+    # Cap on committed output history (bars)
+    MAX_BARS = 20_000
+
+    def __init__(self, window):
+        self.window = window
+        self.beta = None
+        self._reset()
+
+    def _reset(self):
+        from collections import deque
+        w = self.window
+        self.last_closed_ts = -1
+        # Trailing-window deques for the spread and the (a, b) pairs
+        self._spread_win = deque(maxlen=w)
+        self._a_win = deque(maxlen=w)
+        self._b_win = deque(maxlen=w)
+        # Committed per-closed-bar outputs
+        self._ts_out = deque(maxlen=self.MAX_BARS)
+        self._spread_out = deque(maxlen=self.MAX_BARS)
+        self._z_out = deque(maxlen=self.MAX_BARS)
+        self._corr_out = deque(maxlen=self.MAX_BARS)
+
+    def _bar_outputs(self, a, b, spread):
+        """Rolling z and corr for one bar given the trailing deques"""
+        w = self.window
+        if len(self._spread_win) < w:
+            return np.nan, np.nan
+        sw = np.fromiter(self._spread_win, dtype=np.float64, count=w)
+        mean = sw.mean()
+        std = sw.std(ddof=1)
+        z = (spread - mean) / std if std > 0.0 else np.nan
+        aw = np.fromiter(self._a_win, dtype=np.float64, count=w)
+        bw = np.fromiter(self._b_win, dtype=np.float64, count=w)
+        sa, sb = aw.sum(), bw.sum()
+        va = w * (aw @ aw) - sa * sa
+        vb = w * (bw @ bw) - sb * sb
+        denom = va * vb
+        corr = (w * (aw @ bw) - sa * sb) / np.sqrt(denom) if denom > 0.0 else np.nan
+        return z, corr
+
+    def _commit_bar(self, ts, a, b, spread):
+        self._a_win.append(a)
+        self._b_win.append(b)
+        self._spread_win.append(spread)
+        z, corr = self._bar_outputs(a, b, spread)
+        self._ts_out.append(ts)
+        self._spread_out.append(spread)
+        self._z_out.append(z)
+        self._corr_out.append(corr)
+        self.last_closed_ts = ts
+
+    def update(self, price_a, price_b, hedge_ratio):
+        """
+        Fold new bars into the state and return the full output arrays.
+
+        Args:
+            price_a: Series of bar closes for asset A (datetime index)
+            price_b: Series of bar closes for asset B
+            hedge_ratio: Current hedge ratio (beta)
+
+        Returns:
+            tuple: (spread array, z-score array, correlation array,
+                    DatetimeIndex) covering all committed bars plus the
+                    provisional open bar
+        """
+        va, vb, index = _align_pair(price_a, price_b)
+        if len(va) == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty, empty, index
+
+        ts = index.values.astype('datetime64[ns]').view('i8')
+
+        beta_drift = (
+            self.beta is None
+            or abs(hedge_ratio - self.beta) > 1e-3 * max(1.0, abs(self.beta))
+        )
+        if beta_drift or ts[-1] < self.last_closed_ts:
+            self.beta = float(hedge_ratio)
+            self._reset()
+
+        spread_new = va - self.beta * vb
+
+        # Commit every new closed bar (all but the final, still-open one)
+        new_mask = ts > self.last_closed_ts
+        new_pos = np.nonzero(new_mask)[0]
+        for i in new_pos[:-1] if len(new_pos) else []:
+            self._commit_bar(int(ts[i]), float(va[i]), float(vb[i]),
+                             float(spread_new[i]))
+
+        n_closed = len(self._ts_out)
+        spread_out = np.fromiter(self._spread_out, dtype=np.float64,
+                                 count=n_closed)
+        z_out = np.fromiter(self._z_out, dtype=np.float64, count=n_closed)
+        corr_out = np.fromiter(self._corr_out, dtype=np.float64,
+                               count=n_closed)
+        ts_out = np.fromiter(self._ts_out, dtype=np.int64, count=n_closed)
+
+        if len(new_pos):
+            # Evaluate the open bar provisionally without committing it.
+            # A full deque evicts its leftmost element on append, so save
+            # and restore it around the temporary push.
+            i = new_pos[-1]
+            a_i, b_i, s_i = float(va[i]), float(vb[i]), float(spread_new[i])
+            full = len(self._spread_win) == self.window
+            if full:
+                evicted = (self._a_win[0], self._b_win[0], self._spread_win[0])
+            self._a_win.append(a_i)
+            self._b_win.append(b_i)
+            self._spread_win.append(s_i)
+            z_i, corr_i = self._bar_outputs(a_i, b_i, s_i)
+            self._a_win.pop()
+            self._b_win.pop()
+            self._spread_win.pop()
+            if full:
+                self._a_win.appendleft(evicted[0])
+                self._b_win.appendleft(evicted[1])
+                self._spread_win.appendleft(evicted[2])
+            spread_out = np.append(spread_out, s_i)
+            z_out = np.append(z_out, z_i)
+            corr_out = np.append(corr_out, corr_i)
+            ts_out = np.append(ts_out, ts[i])
+
+        return spread_out, z_out, corr_out, pd.to_datetime(ts_out)
 
 
 class QuantAnalytics:
     """Quantitative Analytics for Pairs Trading"""
-    
+
+    # Upper bound on closed bars kept per (symbol, timeframe) in the
+    # incremental OHLC cache (same scale as RollingPairState.MAX_BARS)
+    MAX_CACHED_BARS = 20_000
+
     def __init__(self):
         """Initialize analytics engine"""
         if not STATSMODELS_AVAILABLE:
             print("⚠️ Warning: statsmodels is not installed!")
             print("Some features (ADF test, OLS regression) will not work.")
             print("Install with: pip install statsmodels")
-    
+        # LRU cache of ADF results keyed by a hash of the spread values,
+        # so identical spreads between refreshes skip the expensive
+        # adfuller call entirely
+        self._adf_cache = OrderedDict()
+        # Incremental OHLC cache keyed by (symbol, timeframe).
+        # Each entry: {'last_ts': int ns, 'bars': closed-bars DataFrame,
+        #              'open': [bucket_id, o, h, l, c, v]}
+        self._ohlc_cache = {}
+
+    def _bucket_ohlcv(self, ts_ns, price, qty, bar_ns):
+        """
+        Reduce sorted tick arrays into per-bucket OHLCV arrays.
+
+        Args:
+            ts_ns: int64 array of timestamps (nanoseconds, sorted)
+            price: float array of prices
+            qty: float array of quantities
+            bar_ns: bar width in nanoseconds
+
+        Returns:
+            tuple: (bucket_ids, open, high, low, close, volume) arrays
+        """
+        if NUMBA_AVAILABLE:
+            # Kernel specialized on the bar width (compile-time constant)
+            return ohlc_reduce_for(bar_ns)(
+                ts_ns,
+                price.astype(np.float64, copy=False),
+                qty.astype(np.float64, copy=False),
+            )
+
+        if POLARS_AVAILABLE:
+            # Middle tier for numba-less environments: Polars groups the
+            # precomputed bucket ids in native code, no pandas bin table
+            frame = pl.DataFrame({
+                'bucket': ts_ns // bar_ns,
+                'price': price,
+                'qty': qty,
+            })
+            agg = frame.group_by('bucket', maintain_order=True).agg(
+                pl.col('price').first().alias('open'),
+                pl.col('price').max().alias('high'),
+                pl.col('price').min().alias('low'),
+                pl.col('price').last().alias('close'),
+                pl.col('qty').sum().alias('volume'),
+            )
+            return (agg['bucket'].to_numpy(), agg['open'].to_numpy(),
+                    agg['high'].to_numpy(), agg['low'].to_numpy(),
+                    agg['close'].to_numpy(), agg['volume'].to_numpy())
+
+        bucket = ts_ns // bar_ns
+        starts = np.concatenate(([0], np.nonzero(np.diff(bucket))[0] + 1))
+        o = price[starts]
+        c = price[np.append(starts[1:] - 1, len(price) - 1)]
+        h = np.maximum.reduceat(price, starts)
+        l = np.minimum.reduceat(price, starts)
+        v = np.add.reduceat(qty, starts)
+        return bucket[starts], o, h, l, c, v
+
     def resample_ticks(self, df, timeframe):
         """
         Resample tick data to OHLC format
-        
+
+        Maintains an incremental cache keyed by (symbol, timeframe) so that
+        on repeated calls (e.g. Streamlit reruns) only ticks newer than the
+        last seen timestamp are re-bucketed, instead of resampling the full
+        tick window every time.
+
         Args:
             df: DataFrame with columns ['timestamp', 'price', 'quantity']
             timeframe: String like '1s', '1min', '5min'
-        
+
         Returns:
             DataFrame with OHLC data
         """
-        try:
+        if df.empty:
+            return _EMPTY_DF
+
+        # Ensure timestamp is datetime
+        if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
             df = df.copy()
-            
-            # Ensure timestamp is datetime
-            if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            df = df.set_index("timestamp")
-            
-            # Create OHLC
-            ohlc = df["price"].resample(timeframe).ohlc()
-            volume = df["quantity"].resample(timeframe).sum()
-            
-            ohlc["volume"] = volume
-            
-            # Drop rows with NaN values
-            return ohlc.dropna()
-        
-        except Exception as e:
-            print(f"Error in resample_ticks: {str(e)}")
-            return pd.DataFrame()
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+
+        symbol = df['symbol'].iloc[0] if 'symbol' in df.columns else None
+        ts_ns = df['timestamp'].values.astype('datetime64[ns]').view('i8')
+
+        return self.resample_arrays(
+            ts_ns,
+            df['price'].values.astype(np.float64),
+            df['quantity'].values.astype(np.float64),
+            timeframe,
+            symbol=symbol,
+        )
+
+    def resample_arrays(self, ts_ns, price, qty, timeframe, symbol=None):
+        """
+        Resample tick arrays to OHLC format.
+
+        Array twin of resample_ticks: consumes the struct-of-arrays output
+        of TickStorage.get_latest_arrays directly, skipping DataFrame
+        construction and set_index on the hot path. Shares the incremental
+        per-(symbol, timeframe) cache.
+
+        Args:
+            ts_ns: int64 array of timestamps (nanoseconds, sorted)
+            price: array of prices
+            qty: array of quantities
+            timeframe: String like '1s', '1min', '5min'
+            symbol: Symbol key for the incremental cache (optional)
+
+        Returns:
+            DataFrame with OHLC data
+        """
+        if len(ts_ns) == 0:
+            return _EMPTY_DF
+
+        key = (symbol, timeframe)
+        bar_ns = pd.Timedelta(timeframe).value
+        state = self._ohlc_cache.get(key) if symbol is not None else None
+
+        # Reset the cache if the data went backwards (e.g. DB cleared)
+        if state is not None and ts_ns[-1] < state['last_ts']:
+            state = None
+
+        # Re-seed when the input reaches further back than the cached
+        # history: the incremental path only folds in ticks newer than
+        # last_ts, so a wider fetch (e.g. the export tab after the
+        # charts primed the cache with a shorter window) would silently
+        # lose its older half
+        if state is not None and ts_ns[0] < state['first_ts']:
+            state = None
+
+        if state is not None:
+            # Only re-bucket ticks past the last seen timestamp
+            new_mask = ts_ns > state['last_ts']
+            if not new_mask.any():
+                return self._trim_window(
+                    self._assemble_ohlc(state, bar_ns), ts_ns, bar_ns
+                )
+            ts_new = ts_ns[new_mask]
+            price_new = _as_float(price)[new_mask]
+            qty_new = _as_float(qty)[new_mask]
+        else:
+            state = {'last_ts': 0, 'first_ts': int(ts_ns[0]),
+                     'bars': pd.DataFrame(), 'open': None}
+            ts_new = ts_ns
+            price_new = _as_float(price)
+            qty_new = _as_float(qty)
+
+        bucket_ids, o, h, l, c, v = self._bucket_ohlcv(
+            ts_new, price_new, qty_new, bar_ns
+        )
+
+        # Merge the still-open bucket with the first new bucket if they
+        # belong to the same bar
+        open_bar = state['open']
+        if open_bar is not None and bucket_ids[0] == open_bar[0]:
+            h[0] = max(h[0], open_bar[2])
+            l[0] = min(l[0], open_bar[3])
+            o[0] = open_bar[1]
+            v[0] += open_bar[5]
+        elif open_bar is not None:
+            # Previous open bucket has closed; append it to closed bars
+            state['bars'] = self._append_closed_bar(state['bars'], open_bar, bar_ns)
+
+        # All new buckets except the last are closed
+        if len(bucket_ids) > 1:
+            closed = pd.DataFrame(
+                {
+                    'open': o[:-1],
+                    'high': h[:-1],
+                    'low': l[:-1],
+                    'close': c[:-1],
+                    'volume': v[:-1],
+                },
+                index=pd.to_datetime(bucket_ids[:-1] * bar_ns),
+            )
+            state['bars'] = pd.concat([state['bars'], closed])
+            # Cap the committed history so a long-running session never
+            # grows the cached frame (and the per-call concat over it)
+            # without bound, mirroring RollingPairState.MAX_BARS
+            if len(state['bars']) > self.MAX_CACHED_BARS:
+                state['bars'] = state['bars'].iloc[-self.MAX_CACHED_BARS:]
+                state['first_ts'] = int(state['bars'].index[0].value)
+
+        state['open'] = [bucket_ids[-1], o[-1], h[-1], l[-1], c[-1], v[-1]]
+        state['last_ts'] = int(ts_new[-1])
+
+        if symbol is not None:
+            self._ohlc_cache[key] = state
+
+        return self._trim_window(
+            self._assemble_ohlc(state, bar_ns), ts_ns, bar_ns
+        )
+
+    @staticmethod
+    def _trim_window(bars, ts_ns, bar_ns):
+        """
+        Clip cached bars to the bucket range covered by the input ticks.
+
+        The cache may hold history older than the caller's (sliding)
+        window; returning only bars from the input's first bucket onward
+        keeps the output tracking the input window instead of growing
+        with cache age.
+        """
+        if len(bars) == 0:
+            return bars
+        start = pd.Timestamp((int(ts_ns[0]) // bar_ns) * bar_ns)
+        if bars.index[0] < start:
+            return bars[bars.index >= start]
+        return bars
+
+
+    def _append_closed_bar(self, bars, open_bar, bar_ns):
+        """Append a closed open-bucket row to the closed-bars DataFrame"""
+        row = pd.DataFrame(
+            {
+                'open': [open_bar[1]],
+                'high': [open_bar[2]],
+                'low': [open_bar[3]],
+                'close': [open_bar[4]],
+                'volume': [open_bar[5]],
+            },
+            index=pd.to_datetime([open_bar[0] * bar_ns]),
+        )
+        return pd.concat([bars, row])
+
+    def _assemble_ohlc(self, state, bar_ns):
+        """Combine closed bars with the current open bar into one DataFrame"""
+        if state['open'] is None:
+            return state['bars']
+        # Reuse the previously assembled frame when neither the closed
+        # bars nor the open bucket changed since the last call
+        fingerprint = (len(state['bars']), tuple(state['open']))
+        cached = state.get('assembled')
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        assembled = self._append_closed_bar(state['bars'], state['open'], bar_ns)
+        state['assembled'] = (fingerprint, assembled)
+        return assembled
     
     def calculate_ols_hedge_ratio(self, price_a, price_b):
         """
@@ -64,33 +480,48 @@ class QuantAnalytics:
         Returns:
             tuple: (hedge_ratio, intercept, r_squared)
         """
-        if not STATSMODELS_AVAILABLE:
-            raise ImportError("statsmodels is required for OLS regression. Install with: pip install statsmodels")
-        
-        try:
-            # Align the two price series
-            price_a, price_b = price_a.align(price_b, join="inner")
-            
-            # Remove any NaN values
-            valid_idx = ~(price_a.isna() | price_b.isna())
-            price_a = price_a[valid_idx]
-            price_b = price_b[valid_idx]
-            
-            if len(price_a) < 2:
-                return 1.0, 0.0, 0.0
-            
-            # Prepare data for OLS
-            X = sm.add_constant(price_b.values)
-            
-            # Fit OLS model
-            model = sm.OLS(price_a.values, X).fit()
-            
-            # Return hedge ratio (beta), intercept (alpha), and R-squared
-            return model.params[1], model.params[0], model.rsquared
-        
-        except Exception as e:
-            print(f"Error in calculate_ols_hedge_ratio: {str(e)}")
+        # Align and drop non-finite pairs without any DataFrame churn
+        a, b, _ = _align_pair(price_a, price_b)
+
+        if len(a) < 2:
             return 1.0, 0.0, 0.0
+
+        a = a.astype(np.float64, copy=False)
+        b = b.astype(np.float64, copy=False)
+
+        if NUMBA_AVAILABLE:
+            # Single JIT loop accumulating the five sums; beta, alpha
+            # and R² all fall out without any residual array
+            beta, alpha, r_squared = ols_beta_alpha_r2(a, b)
+            if np.isfinite(beta):
+                return beta, alpha, r_squared
+            # NaN beta signals a zero-variance regressor; fall through
+            # to the degenerate handling below
+
+        # Closed-form univariate OLS: a couple of dot products instead
+        # of building and fitting a statsmodels model object
+        ma = a.mean()
+        mb = b.mean()
+        da = a - ma
+        db = b - mb
+        var_b = db @ db
+
+        if var_b == 0.0:
+            # Degenerate regressor: with zero variance in b the slope is
+            # undefined (statsmodels can't help - add_constant skips the
+            # constant column for an already-constant regressor), so
+            # return the neutral fallback
+            return 1.0, 0.0, 0.0
+
+        beta = (da @ db) / var_b
+        alpha = ma - beta * mb
+        ss_tot = da @ da
+        if ss_tot == 0.0:
+            return beta, alpha, 0.0
+        residuals = a - alpha - beta * b
+        r_squared = 1.0 - (residuals @ residuals) / ss_tot
+
+        return beta, alpha, r_squared
     
     def calculate_spread(self, price_a, price_b, hedge_ratio):
         """
@@ -104,19 +535,68 @@ class QuantAnalytics:
         Returns:
             Series: The spread (price_a - hedge_ratio * price_b)
         """
-        try:
-            # Align the two price series
-            price_a, price_b = price_a.align(price_b, join="inner")
-            
-            # Calculate spread
-            spread = (price_a - hedge_ratio * price_b).dropna()
-            
-            return spread
-        
-        except Exception as e:
-            print(f"Error in calculate_spread: {str(e)}")
-            return pd.Series()
+        if price_a.size == 0 or price_b.size == 0:
+            return _EMPTY_SERIES
+
+        # Align and drop non-finite pairs without any DataFrame churn
+        a, b, index = _align_pair(price_a, price_b)
+
+        # Calculate spread
+        return pd.Series(a - hedge_ratio * b, index=index)
     
+    def calculate_spread_zscore(self, price_a, price_b, hedge_ratio,
+                                window=20, threshold=None):
+        """
+        Calculate spread and rolling z-score in one fused pass
+
+        Args:
+            price_a: Series of prices for asset A
+            price_b: Series of prices for asset B
+            hedge_ratio: The hedge ratio (beta)
+            window: Rolling window size
+            threshold: Optional alert threshold on |z-score|
+
+        Returns:
+            tuple: (spread array, z-score array with leading NaNs, shared
+                    pd.Index, last z-score or None, True if |last z-score|
+                    exceeds threshold)
+
+        Arrays are returned instead of Series so callers can hand them
+        straight to Plotly (or index them) without paying for Series
+        construction on every refresh.
+        """
+        empty = np.empty(0, dtype=np.float64)
+        if price_a.size == 0 or price_b.size == 0:
+            return empty, empty, _EMPTY_SERIES.index, None, False
+
+        if NUMBA_AVAILABLE:
+            va, vb, index = _align_pair(price_a, price_b)
+            # Window-specialized variant: the slider value is baked into
+            # the compiled loop as a constant
+            spread_arr, z_arr = fused_spread_z_for(window)(
+                va, vb, float(hedge_ratio)
+            )
+        else:
+            spread = self.calculate_spread(price_a, price_b, hedge_ratio)
+            index = spread.index
+            spread_arr = spread.to_numpy()
+            z_arr = np.full(len(spread_arr), np.nan)
+            zscore = self.calculate_zscore(spread, window=window)
+            if not zscore.empty:
+                z_arr[-len(zscore):] = zscore.to_numpy()
+
+        last_z = (
+            float(z_arr[-1])
+            if z_arr.size and np.isfinite(z_arr[-1])
+            else None
+        )
+        hit = (
+            threshold is not None
+            and last_z is not None
+            and abs(last_z) > threshold
+        )
+        return spread_arr, z_arr, index, last_z, hit
+
     def calculate_zscore(self, series, window=20):
         """
         Calculate rolling z-score
@@ -128,22 +608,24 @@ class QuantAnalytics:
         Returns:
             Series: Z-score values
         """
-        try:
-            # Calculate rolling mean and std
-            rolling_mean = series.rolling(window=window).mean()
-            rolling_std = series.rolling(window=window).std()
-            
-            # Avoid division by zero
-            rolling_std = rolling_std.replace(0, np.nan)
-            
-            # Calculate z-score
-            zscore = ((series - rolling_mean) / rolling_std).dropna()
-            
-            return zscore
-        
-        except Exception as e:
-            print(f"Error in calculate_zscore: {str(e)}")
-            return pd.Series()
+        if series.size < window:
+            return _EMPTY_SERIES
+
+        if NUMBA_AVAILABLE:
+            # Single-pass compiled kernel specialized on the window: one
+            # scan instead of two rolling reductions plus arithmetic
+            values = rolling_zscore_for(window)(_as_float(series.to_numpy()))
+            return pd.Series(values, index=series.index).dropna()
+
+        # Calculate rolling mean and std
+        rolling_mean = series.rolling(window=window).mean()
+        rolling_std = series.rolling(window=window).std()
+
+        # Avoid division by zero
+        rolling_std = rolling_std.replace(0, np.nan)
+
+        # Calculate z-score
+        return ((series - rolling_mean) / rolling_std).dropna()
     
     def calculate_rolling_correlation(self, a, b, window=20):
         """
@@ -157,13 +639,35 @@ class QuantAnalytics:
         Returns:
             Series: Rolling correlation values
         """
-        try:
-            correlation = a.rolling(window=window).corr(b).dropna()
-            return correlation
-        
-        except Exception as e:
-            print(f"Error in calculate_rolling_correlation: {str(e)}")
-            return pd.Series()
+        if a.size < window or b.size < window:
+            return _EMPTY_SERIES
+
+        values, index = self.rolling_correlation_arrays(a, b, window=window)
+        return pd.Series(values, index=index).dropna()
+
+    def rolling_correlation_arrays(self, a, b, window=20):
+        """
+        Rolling correlation returned as a raw array plus its index
+
+        Args:
+            a: First price series
+            b: Second price series
+            window: Rolling window size
+
+        Returns:
+            tuple: (correlation array with leading NaNs, shared pd.Index)
+        """
+        if a.size < window or b.size < window:
+            return np.empty(0, dtype=np.float64), _EMPTY_SERIES.index
+
+        if NUMBA_AVAILABLE:
+            # Fused five-accumulator kernel: one pass instead of the
+            # several rolling reductions inside pandas' rolling corr
+            va, vb, index = _align_pair(a, b)
+            return rolling_corr(va, vb, window), index
+
+        correlation = a.rolling(window=window).corr(b)
+        return correlation.to_numpy(), correlation.index
     
     def calculate_summary_stats(self, series):
         """
@@ -175,19 +679,7 @@ class QuantAnalytics:
         Returns:
             dict: Summary statistics
         """
-        try:
-            return {
-                "mean": float(series.mean()),
-                "std": float(series.std()),
-                "min": float(series.min()),
-                "max": float(series.max()),
-                "skew": float(series.skew()),
-                "kurtosis": float(series.kurtosis()),
-                "count": int(len(series))
-            }
-        
-        except Exception as e:
-            print(f"Error in calculate_summary_stats: {str(e)}")
+        if series.size == 0:
             return {
                 "mean": 0.0,
                 "std": 0.0,
@@ -197,14 +689,82 @@ class QuantAnalytics:
                 "kurtosis": 0.0,
                 "count": 0
             }
+
+        return {
+            "mean": float(series.mean()),
+            "std": float(series.std()),
+            "min": float(series.min()),
+            "max": float(series.max()),
+            "skew": float(series.skew()),
+            "kurtosis": float(series.kurtosis()),
+            "count": int(len(series))
+        }
     
-    def adf_test(self, series):
+    def _fast_adf(self, y, maxlag):
+        """
+        Fixed-lag ADF test via a direct least-squares solve.
+
+        Builds the augmented regression (level, constant, lagged
+        differences) as one design matrix and solves it inside the
+        adf_tstat JIT kernel, or with LAPACK's gelsy driver when numba
+        is absent - either way skipping statsmodels' per-call
+        model/result object construction. P-value and critical values
+        come from the same MacKinnon tables adfuller uses, so results
+        match.
+
+        Args:
+            y: float64 array (no NaNs)
+            maxlag: number of lagged differences in the regression
+
+        Returns:
+            tuple: (adf_statistic, p_value, {'1%','5%','10%'} criticals)
+        """
+        if NUMBA_AVAILABLE:
+            # Design matrix build and solve both live in the JIT kernel
+            adf_stat, nobs = adf_tstat(y, maxlag)
+            if not np.isfinite(adf_stat):
+                raise np.linalg.LinAlgError("singular ADF design matrix")
+        else:
+            dy = np.diff(y)
+            nobs = len(dy) - maxlag
+
+            # Design matrix: [y_{t-1}, const, dy_{t-1} .. dy_{t-maxlag}]
+            X = np.empty((nobs, 2 + maxlag), dtype=np.float64)
+            X[:, 0] = y[maxlag:-1]
+            X[:, 1] = 1.0
+            for k in range(1, maxlag + 1):
+                X[:, 1 + k] = dy[maxlag - k:len(dy) - k]
+            target = dy[maxlag:]
+
+            beta, _, rank, _ = scipy_linalg.lstsq(
+                X, target, lapack_driver="gelsy"
+            )
+            if rank < X.shape[1]:
+                raise np.linalg.LinAlgError("singular ADF design matrix")
+
+            resid = target - X @ beta
+            dof = nobs - X.shape[1]
+            sigma2 = (resid @ resid) / dof
+            se = np.sqrt(sigma2 * np.linalg.inv(X.T @ X)[0, 0])
+            adf_stat = beta[0] / se
+
+        p_value = mackinnonp(adf_stat, regression="c", N=1)
+        crit = mackinnoncrit(N=1, regression="c", nobs=nobs)
+        return (
+            float(adf_stat),
+            float(p_value),
+            {"1%": crit[0], "5%": crit[1], "10%": crit[2]},
+        )
+
+    def adf_test(self, series, maxlag=None):
         """
         Perform Augmented Dickey-Fuller test for stationarity
-        
+
         Args:
             series: Time series data
-        
+            maxlag: Lag order for the test regression. Defaults to the
+                Schwert rule 12*(n/100)^0.25 capped at 8.
+
         Returns:
             dict: ADF test results
         """
@@ -217,20 +777,48 @@ class QuantAnalytics:
         try:
             # Remove NaN values
             series = series.dropna()
-            
+
             # Check minimum data points
             if len(series) < 50:
                 raise ValueError(f"ADF test requires at least 50 data points. Got {len(series)}.")
+
+            values = series.to_numpy(dtype=np.float64)
+
+            # Fix the lag deterministically (Schwert rule of thumb,
+            # capped at 8 - mean-reverting crypto spreads need few lags)
+            # so a single regression is run instead of an AIC search
+            # refitting across every candidate lag
+            if maxlag is None:
+                maxlag = max(1, min(8, int(12 * (len(values) / 100) ** 0.25)))
+
+            # Identical spreads between refreshes hit the LRU cache
+            cache_key = (len(values), _hash_bytes(values.tobytes()), maxlag)
+            cached = self._adf_cache.get(cache_key)
+            if cached is not None:
+                self._adf_cache.move_to_end(cache_key)
+                return cached
+
+            # Perform ADF test: direct solve when numba or scipy is
+            # around, with adfuller as the safety net
+            if NUMBA_AVAILABLE or SCIPY_AVAILABLE:
+                try:
+                    adf_stat, p_value, critical_values = self._fast_adf(
+                        values, maxlag
+                    )
+                except Exception:
+                    result = adfuller(values, maxlag=maxlag, autolag=None,
+                                      regression="c")
+                    adf_stat, p_value, critical_values = (
+                        result[0], result[1], result[4]
+                    )
+            else:
+                result = adfuller(values, maxlag=maxlag, autolag=None,
+                                  regression="c")
+                adf_stat, p_value, critical_values = (
+                    result[0], result[1], result[4]
+                )
             
-            # Perform ADF test
-            result = adfuller(series, autolag="AIC")
-            
-            # Extract results
-            adf_stat = result[0]
-            p_value = result[1]
-            critical_values = result[4]
-            
-            return {
+            results = {
                 "adf_statistic": float(adf_stat),
                 "p_value": float(p_value),
                 "critical_1%": float(critical_values["1%"]),
@@ -240,6 +828,12 @@ class QuantAnalytics:
                 "n_observations": len(series),
                 "interpretation": "Stationary (reject null hypothesis)" if p_value < 0.05 else "Non-stationary (fail to reject null hypothesis)"
             }
+
+            self._adf_cache[cache_key] = results
+            while len(self._adf_cache) > 32:
+                self._adf_cache.popitem(last=False)
+
+            return results
         
         except ImportError as e:
             raise ImportError(str(e))
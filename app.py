@@ -4,13 +4,32 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 
+try:
+    # orjson serializes the numpy trace arrays directly and is several
+    # times faster than stdlib json for the per-refresh figure payloads
+    import orjson
+    pio.json.config.default_engine = "orjson"
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv
+    import pyarrow.feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 from storage import TickStorage
-from ingestion import BinanceTickIngestion
-from analytics import QuantAnalytics
+from ingestion import AnalyticsWorker, BinanceTickIngestion
+from analytics import QuantAnalytics, RollingPairState
 
 # ------------------------------------------------------------------
 # Page config
@@ -47,8 +66,28 @@ if "ingestion" not in st.session_state:
 if "analytics" not in st.session_state:
     st.session_state.analytics = QuantAnalytics()
 
+if "analytics_worker" not in st.session_state:
+    # Background thread recomputing the pair pipeline at flush rate;
+    # reruns read its published snapshots instead of blocking. It gets
+    # its own QuantAnalytics instance: the incremental OHLC cache does
+    # unsynchronized read-modify-write, so sharing one with the script
+    # thread (which resamples the same keys every rerun) could fold the
+    # same ticks into a state twice
+    st.session_state.analytics_worker = AnalyticsWorker(
+        st.session_state.storage, QuantAnalytics()
+    )
+    st.session_state.analytics_worker.start()
+
 if "alerts" not in st.session_state:
     st.session_state.alerts = []
+if "alert_ts" not in st.session_state:
+    # Parallel set of alert timestamps for O(1) duplicate checks no
+    # matter how long the alert list grows
+    st.session_state.alert_ts = set()
+if "last_alert_mono" not in st.session_state:
+    # Monotonic time of the last alert, kept outside the alert records
+    # so the dedup bookkeeping never leaks into exports
+    st.session_state.last_alert_mono = None
 
 if "run_adf" not in st.session_state:
     st.session_state.run_adf = False
@@ -59,6 +98,236 @@ if "auto_started" not in st.session_state:
 if "adf_results" not in st.session_state:
     st.session_state.adf_results = None
 
+# ------------------------------------------------------------------
+# Cached computation helpers
+# ------------------------------------------------------------------
+# The last-tick timestamps act as cheap cache keys: they come straight
+# from the in-memory ring buffers and uniquely determine the pipeline
+# inputs, so when no new tick arrived the whole pipeline is served from
+# cache instead of being recomputed on every rerun.
+@st.cache_data(ttl=1.0, max_entries=16, show_spinner=False)
+def _fetch_ticks(symbol, n, last_ts):
+    """
+    Shared tick fetch: every tab that needs the same (symbol, n) slice
+    in a rerun gets the one materialized DataFrame instead of hitting
+    storage again. last_ts keys the cache so new ticks invalidate it.
+    """
+    return st.session_state.storage.get_latest_ticks(symbol, n=n)
+
+
+# Two workers, one per symbol: the resample kernels are compiled with
+# nogil=True so both legs genuinely overlap on a multi-core box.
+# cache_resource keeps one executor for the process; a module-level pool
+# would be recreated on every script rerun
+@st.cache_resource(show_spinner=False)
+def _pipeline_pool():
+    return ThreadPoolExecutor(max_workers=2)
+
+
+@st.cache_data(ttl=1.0, max_entries=8, show_spinner=False)
+def _compute_pair(symbol_a, symbol_b, timeframe, rolling_window,
+                  alert_threshold, last_ts_a, last_ts_b):
+    """Fetch, resample and run the pair analytics for one symbol pair"""
+    storage = st.session_state.storage
+    analytics = st.session_state.analytics
+
+    # Prefer the background worker's published snapshot; the inline
+    # pipeline below only runs before the worker's first publish
+    worker = st.session_state.get("analytics_worker")
+    if worker is not None:
+        published = worker.get_latest(
+            (symbol_a, symbol_b, timeframe, rolling_window)
+        )
+        if published is not None:
+            return published
+
+    df_a = _fetch_ticks(symbol_a, 5000, last_ts_a)
+    df_b = _fetch_ticks(symbol_b, 5000, last_ts_b)
+    if df_a.empty or df_b.empty:
+        return None
+
+    # The two legs are independent; resample them concurrently
+    future_a = _pipeline_pool().submit(analytics.resample_ticks, df_a, timeframe)
+    ohlc_b = analytics.resample_ticks(df_b, timeframe)
+    ohlc_a = future_a.result()
+
+    result = {
+        "ohlc_a": ohlc_a,
+        "ohlc_b": ohlc_b,
+        "ready": (
+            not ohlc_a.empty
+            and not ohlc_b.empty
+            and len(ohlc_a) > rolling_window
+        ),
+    }
+    if not result["ready"]:
+        return result
+
+    price_a = ohlc_a["close"]
+    price_b = ohlc_b["close"]
+
+    hedge_ratio, alpha, r_squared = analytics.calculate_ols_hedge_ratio(
+        price_a, price_b
+    )
+    # Incremental rolling state: only bars newer than the last committed
+    # one are folded in; unchanged history is served from the state
+    states = st.session_state.setdefault("rolling_states", {})
+    state_key = (symbol_a, symbol_b, timeframe, rolling_window)
+    state = states.get(state_key)
+    if state is None:
+        state = RollingPairState(rolling_window)
+        states[state_key] = state
+
+    spread_arr, z_arr, corr_arr, pair_index = state.update(
+        price_a, price_b, hedge_ratio
+    )
+    corr_index = pair_index
+
+    last_z = (
+        float(z_arr[-1])
+        if z_arr.size and np.isfinite(z_arr[-1])
+        else None
+    )
+    alert_hit = last_z is not None and abs(last_z) > alert_threshold
+
+    result.update(
+        price_a=price_a,
+        price_b=price_b,
+        hedge_ratio=hedge_ratio,
+        alpha=alpha,
+        r_squared=r_squared,
+        spread=spread_arr,
+        zscore=z_arr,
+        pair_index=pair_index,
+        last_z=last_z,
+        alert_hit=alert_hit,
+        correlation=corr_arr,
+        corr_index=corr_index,
+    )
+    return result
+
+
+@st.cache_data(ttl=2.0, show_spinner=False)
+def _get_available_symbols():
+    """Cached wrapper around the DISTINCT-symbols query"""
+    return st.session_state.storage.get_symbols()
+
+
+# st.fragment landed after 1.35; degrade to plain functions on older
+# versions so only the decorator (not the charts) is lost
+_fragment = getattr(st, "fragment", None) or (lambda func: func)
+
+
+def _df_to_csv_bytes(df):
+    """
+    Serialize a frame to CSV bytes.
+
+    Goes through pyarrow's C++ CSV writer in 8192-row batches when
+    available - no whole-frame Python string is ever built - and falls
+    back to pandas to_csv otherwise.
+    """
+    if PYARROW_AVAILABLE:
+        from io import BytesIO
+        sink = BytesIO()
+        pyarrow.csv.write_csv(
+            pa.Table.from_pandas(df, preserve_index=True),
+            sink,
+            write_options=pyarrow.csv.WriteOptions(batch_size=8192),
+        )
+        return sink.getvalue()
+    return df.to_csv(index=True).encode()
+
+
+@st.cache_data(ttl=1.0, max_entries=16, show_spinner=False)
+def _summary_stats(symbol, timeframe, last_ts, _close):
+    """Summary stats memoized on (symbol, timeframe, last_ts)"""
+    return st.session_state.analytics.calculate_summary_stats(_close)
+
+
+@st.cache_data(ttl=5.0, max_entries=16, show_spinner=False)
+def _memo_norm(symbol, timeframe, last_ts, _values):
+    """
+    Normalized %-change array for a price leg, memoized on
+    (symbol, timeframe, last_ts) - the underscore keeps the array itself
+    out of the cache key so only the cheap scalars are hashed.
+    """
+    return ((_values / _values[0] - 1.0) * 100.0).astype(np.float32)
+
+
+@_fragment
+def _render_pair_charts(symbol_a, symbol_b, price_a, price_b,
+                        pair_index, spread, zscore, alert_threshold,
+                        timeframe, last_ts_a, last_ts_b):
+    """Price/spread subplot as a fragment: reruns scoped to the chart"""
+    fig1 = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=(f'{symbol_a} vs {symbol_b} Prices', 'Spread & Z-Score'),
+        vertical_spacing=0.15,
+        row_heights=[0.5, 0.5]
+    )
+
+    # Normalized legs as raw ndarrays (Plotly serializes ndarrays faster
+    # than Series), memoized so unchanged data reuses the same arrays
+    pa_norm = _memo_norm(symbol_a, timeframe, last_ts_a, price_a.to_numpy())
+    pb_norm = _memo_norm(symbol_b, timeframe, last_ts_b, price_b.to_numpy())
+    idx_a = price_a.index.values
+    idx_b = price_b.index.values
+
+    fig1.add_trace(
+        go.Scatter(x=idx_a, y=pa_norm, name=symbol_a, mode='lines', line=dict(color='#3b82f6')),
+        row=1, col=1
+    )
+    fig1.add_trace(
+        go.Scatter(x=idx_b, y=pb_norm, name=symbol_b, mode='lines', line=dict(color='#ef4444')),
+        row=1, col=1
+    )
+
+    # Spread and Z-score
+    fig1.add_trace(
+        go.Scatter(x=pair_index.values, y=spread, name='Spread', mode='lines', line=dict(color='#10b981')),
+        row=2, col=1
+    )
+
+    if zscore.size:
+        fig1.add_trace(
+            go.Scatter(x=pair_index.values, y=zscore, name='Z-Score', mode='lines', line=dict(color='#f59e0b'), yaxis='y3'),
+            row=2, col=1
+        )
+
+        # Add threshold lines
+        fig1.add_hline(y=alert_threshold, line_dash="dash", line_color="red", opacity=0.5, row=2, col=1)
+        fig1.add_hline(y=-alert_threshold, line_dash="dash", line_color="red", opacity=0.5, row=2, col=1)
+        fig1.add_hline(y=0, line_dash="dot", line_color="gray", opacity=0.3, row=2, col=1)
+
+    fig1.update_xaxes(title_text="Time", row=2, col=1)
+    fig1.update_yaxes(title_text="% Change", row=1, col=1)
+    fig1.update_yaxes(title_text="Spread Value", row=2, col=1)
+
+    fig1.update_layout(height=700, showlegend=True, hovermode='x unified')
+    # Stable key: the client reuses the chart component and diffs the
+    # payload instead of remounting it on every refresh
+    st.plotly_chart(fig1, use_container_width=True, key="pair_charts")
+
+
+@_fragment
+def _render_correlation_chart(correlation, corr_index):
+    """Rolling-correlation area chart fragment"""
+    fig2 = go.Figure()
+    fig2.add_trace(
+        go.Scatter(x=corr_index.values,
+                 y=correlation,
+                 fill='tozeroy', name='Correlation',
+                 mode='lines', line=dict(color='#8b5cf6'))
+    )
+    fig2.update_layout(
+        height=300,
+        xaxis_title="Time",
+        yaxis_title="Correlation",
+        hovermode='x'
+    )
+    st.plotly_chart(fig2, use_container_width=True, key="correlation_chart")
+
+
 # ------------------------------------------------------------------
 # Header
 # ------------------------------------------------------------------
@@ -138,7 +407,7 @@ else:
 st.sidebar.markdown("---")
 st.sidebar.subheader("Analytics Config")
 
-available_symbols = st.session_state.storage.get_symbols()
+available_symbols = _get_available_symbols()
 if not available_symbols:
     available_symbols = symbols
 
@@ -172,6 +441,12 @@ alert_threshold = st.sidebar.slider("Alert Z-Score", 1.0, 4.0, 2.0, 0.1)
 st.sidebar.markdown("---")
 st.sidebar.subheader("Stationarity Test")
 
+adf_maxlag = st.sidebar.slider(
+    "ADF Max Lag (0 = auto)", 0, 8, 0,
+    help="Lag order for the ADF regression. 0 uses the Schwert rule "
+         "12*(n/100)^0.25 capped at 8.",
+)
+
 if st.sidebar.button("🔬 Run ADF Test", use_container_width=True):
     st.session_state.run_adf = True
     st.rerun()
@@ -211,42 +486,32 @@ with tab1:
             st.rerun()
     else:
         try:
-            df_a = st.session_state.storage.get_latest_ticks(symbol_a, n=5000)
-            df_b = st.session_state.storage.get_latest_ticks(symbol_b, n=5000)
-
-            if not df_a.empty and not df_b.empty:
-                # Resample to OHLC
-                ohlc_a = st.session_state.analytics.resample_ticks(df_a, timeframe)
-                ohlc_b = st.session_state.analytics.resample_ticks(df_b, timeframe)
-
-                if (
-                    not ohlc_a.empty
-                    and not ohlc_b.empty
-                    and len(ohlc_a) > rolling_window
-                ):
-                    price_a = ohlc_a["close"]
-                    price_b = ohlc_b["close"]
-
-                    # Calculate metrics
-                    hedge_ratio, alpha, r_squared = (
-                        st.session_state.analytics.calculate_ols_hedge_ratio(
-                            price_a, price_b
-                        )
-                    )
-
-                    spread = st.session_state.analytics.calculate_spread(
-                        price_a, price_b, hedge_ratio
-                    )
-
-                    zscore = st.session_state.analytics.calculate_zscore(
-                        spread, window=rolling_window
-                    )
+            st.session_state.analytics_worker.configure(
+                symbol_a, symbol_b, timeframe, rolling_window, alert_threshold
+            )
+            last_ts_a = st.session_state.storage.get_last_timestamp(symbol_a)
+            last_ts_b = st.session_state.storage.get_last_timestamp(symbol_b)
+            pair = _compute_pair(
+                symbol_a, symbol_b, timeframe, rolling_window,
+                alert_threshold, last_ts_a, last_ts_b,
+            )
 
-                    correlation = (
-                        st.session_state.analytics.calculate_rolling_correlation(
-                            price_a, price_b, window=rolling_window
-                        )
-                    )
+            if pair is not None:
+                ohlc_a = pair["ohlc_a"]
+                ohlc_b = pair["ohlc_b"]
+
+                if pair["ready"]:
+                    price_a = pair["price_a"]
+                    price_b = pair["price_b"]
+                    hedge_ratio = pair["hedge_ratio"]
+                    r_squared = pair["r_squared"]
+                    spread = pair["spread"]
+                    zscore = pair["zscore"]
+                    pair_index = pair["pair_index"]
+                    last_z = pair["last_z"]
+                    alert_hit = pair["alert_hit"]
+                    correlation = pair["correlation"]
+                    corr_index = pair["corr_index"]
 
                     # Display key metrics
                     st.markdown("### 📊 Key Metrics")
@@ -255,31 +520,36 @@ with tab1:
                     col2.metric("R² (Fit Quality)", f"{r_squared:.4f}")
                     col3.metric(
                         "Current Z-Score",
-                        f"{zscore.iloc[-1]:.2f}" if not zscore.empty else "N/A",
+                        f"{last_z:.2f}" if last_z is not None else "N/A",
                     )
                     col4.metric(
                         "Correlation",
-                        f"{correlation.iloc[-1]:.4f}" if not correlation.empty else "N/A",
+                        f"{correlation[-1]:.4f}"
+                        if correlation.size and np.isfinite(correlation[-1])
+                        else "N/A",
                     )
 
                     # Check for alerts
-                    if not zscore.empty and abs(zscore.iloc[-1]) > alert_threshold:
-                        # Avoid duplicate alerts
-                        last_alert = st.session_state.alerts[-1] if st.session_state.alerts else None
-                        current_time = datetime.now()
-                        
+                    if alert_hit:
+                        # Avoid duplicate alerts: compare monotonic floats
+                        # instead of re-parsing the display timestamp
+                        last_mono = st.session_state.last_alert_mono
+                        now_mono = time.monotonic()
+
                         should_add_alert = True
-                        if last_alert:
-                            last_time = datetime.strptime(last_alert['timestamp'], "%Y-%m-%d %H:%M:%S")
-                            if (current_time - last_time).seconds < 5:  # Don't add alert within 5 seconds
-                                should_add_alert = False
-                        
-                        if should_add_alert:
+                        if last_mono is not None and now_mono - last_mono < 5:
+                            # Don't add alert within 5 seconds
+                            should_add_alert = False
+
+                        ts_display = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        if should_add_alert and ts_display not in st.session_state.alert_ts:
+                            st.session_state.last_alert_mono = now_mono
+                            st.session_state.alert_ts.add(ts_display)
                             st.session_state.alerts.append({
-                                "timestamp": current_time.strftime("%Y-%m-%d %H:%M:%S"),
+                                "timestamp": ts_display,
                                 "symbol_pair": f"{symbol_a}/{symbol_b}",
-                                "zscore": zscore.iloc[-1],
-                                "spread": spread.iloc[-1]
+                                "zscore": last_z,
+                                "spread": spread[-1]
                             })
 
                     # Store spread for ADF test
@@ -287,68 +557,18 @@ with tab1:
 
                     # Create visualizations
                     st.markdown("### 📈 Price Charts")
-                    
-                    # Price comparison chart
-                    fig1 = make_subplots(
-                        rows=2, cols=1,
-                        subplot_titles=(f'{symbol_a} vs {symbol_b} Prices', 'Spread & Z-Score'),
-                        vertical_spacing=0.15,
-                        row_heights=[0.5, 0.5]
-                    )
 
-                    # Normalize prices for comparison
-                    price_a_norm = (price_a - price_a.iloc[0]) / price_a.iloc[0] * 100
-                    price_b_norm = (price_b - price_b.iloc[0]) / price_b.iloc[0] * 100
-
-                    fig1.add_trace(
-                        go.Scatter(x=price_a_norm.index, y=price_a_norm, name=symbol_a, line=dict(color='#3b82f6')),
-                        row=1, col=1
-                    )
-                    fig1.add_trace(
-                        go.Scatter(x=price_b_norm.index, y=price_b_norm, name=symbol_b, line=dict(color='#ef4444')),
-                        row=1, col=1
-                    )
-
-                    # Spread and Z-score
-                    fig1.add_trace(
-                        go.Scatter(x=spread.index, y=spread, name='Spread', line=dict(color='#10b981')),
-                        row=2, col=1
+                    # Price comparison chart
+                    _render_pair_charts(
+                        symbol_a, symbol_b, price_a, price_b,
+                        pair_index, spread, zscore, alert_threshold,
+                        timeframe, last_ts_a, last_ts_b,
                     )
-                    
-                    if not zscore.empty:
-                        fig1.add_trace(
-                            go.Scatter(x=zscore.index, y=zscore, name='Z-Score', line=dict(color='#f59e0b'), yaxis='y3'),
-                            row=2, col=1
-                        )
-                        
-                        # Add threshold lines
-                        fig1.add_hline(y=alert_threshold, line_dash="dash", line_color="red", opacity=0.5, row=2, col=1)
-                        fig1.add_hline(y=-alert_threshold, line_dash="dash", line_color="red", opacity=0.5, row=2, col=1)
-                        fig1.add_hline(y=0, line_dash="dot", line_color="gray", opacity=0.3, row=2, col=1)
-
-                    fig1.update_xaxes(title_text="Time", row=2, col=1)
-                    fig1.update_yaxes(title_text="% Change", row=1, col=1)
-                    fig1.update_yaxes(title_text="Spread Value", row=2, col=1)
-
-                    fig1.update_layout(height=700, showlegend=True, hovermode='x unified')
-                    st.plotly_chart(fig1, use_container_width=True)
 
                     # Correlation chart
                     st.markdown("### 🔗 Rolling Correlation")
-                    if not correlation.empty:
-                        fig2 = go.Figure()
-                        fig2.add_trace(
-                            go.Scatter(x=correlation.index, y=correlation, 
-                                     fill='tozeroy', name='Correlation',
-                                     line=dict(color='#8b5cf6'))
-                        )
-                        fig2.update_layout(
-                            height=300,
-                            xaxis_title="Time",
-                            yaxis_title="Correlation",
-                            hovermode='x'
-                        )
-                        st.plotly_chart(fig2, use_container_width=True)
+                    if correlation.size:
+                        _render_correlation_chart(correlation, corr_index)
 
                     # ADF Test Section - FIXED TO ALWAYS SHOW WHEN TRIGGERED
                     if st.session_state.run_adf or st.session_state.adf_results is not None:
@@ -357,7 +577,9 @@ with tab1:
 
                         # Run ADF test if triggered
                         if st.session_state.run_adf:
-                            clean_spread = spread.dropna()
+                            clean_spread = pd.Series(
+                                spread[np.isfinite(spread)]
+                            )
 
                             if clean_spread.shape[0] < 50:
                                 st.warning(f"⚠️ ADF test requires at least 50 data points. Current: {clean_spread.shape[0]}")
@@ -367,7 +589,10 @@ with tab1:
                             else:
                                 try:
                                     with st.spinner("Running ADF test..."):
-                                        adf_results = st.session_state.analytics.adf_test(clean_spread)
+                                        adf_results = st.session_state.analytics.adf_test(
+                                            clean_spread,
+                                            maxlag=adf_maxlag or None,
+                                        )
                                         st.session_state.adf_results = adf_results
                                         st.session_state.run_adf = False
                                     
@@ -434,33 +659,39 @@ with tab2:
 
     if tick_count_a > 0 and tick_count_b > 0:
         try:
-            df_a = st.session_state.storage.get_latest_ticks(symbol_a, n=5000)
-            df_b = st.session_state.storage.get_latest_ticks(symbol_b, n=5000)
+            df_a = _fetch_ticks(
+                symbol_a, 5000, st.session_state.storage.get_last_timestamp(symbol_a)
+            )
+            df_b = _fetch_ticks(
+                symbol_b, 5000, st.session_state.storage.get_last_timestamp(symbol_b)
+            )
 
             if not df_a.empty and not df_b.empty:
                 ohlc_a = st.session_state.analytics.resample_ticks(df_a, timeframe)
                 ohlc_b = st.session_state.analytics.resample_ticks(df_b, timeframe)
 
                 if not ohlc_a.empty and not ohlc_b.empty:
-                    stats_a = st.session_state.analytics.calculate_summary_stats(
-                        ohlc_a["close"]
+                    stats_a = _summary_stats(
+                        symbol_a, timeframe,
+                        st.session_state.storage.get_last_timestamp(symbol_a),
+                        ohlc_a["close"],
                     )
-                    stats_b = st.session_state.analytics.calculate_summary_stats(
-                        ohlc_b["close"]
+                    stats_b = _summary_stats(
+                        symbol_b, timeframe,
+                        st.session_state.storage.get_last_timestamp(symbol_b),
+                        ohlc_b["close"],
                     )
 
                     col1, col2 = st.columns(2)
                     with col1:
                         st.markdown(f"### {symbol_a}")
-                        stats_df_a = pd.DataFrame([stats_a]).T
-                        stats_df_a.columns = ['Value']
-                        st.dataframe(stats_df_a, use_container_width=True)
-                        
+                        # A Series renders the same table without a full
+                        # DataFrame construction + transpose per rerun
+                        st.dataframe(pd.Series(stats_a, name='Value'), use_container_width=True)
+
                     with col2:
                         st.markdown(f"### {symbol_b}")
-                        stats_df_b = pd.DataFrame([stats_b]).T
-                        stats_df_b.columns = ['Value']
-                        st.dataframe(stats_df_b, use_container_width=True)
+                        st.dataframe(pd.Series(stats_b, name='Value'), use_container_width=True)
 
                     # Additional tick statistics
                     st.markdown("---")
@@ -511,6 +742,8 @@ with tab3:
         with col_btn1:
             if st.button("🗑️ Clear All Alerts", use_container_width=True):
                 st.session_state.alerts = []
+                st.session_state.alert_ts = set()
+                st.session_state.last_alert_mono = None
                 st.rerun()
             
     else:
@@ -529,7 +762,12 @@ with tab4:
     st.subheader("💾 Export Data")
     
     if tick_count_a > 0 or tick_count_b > 0:
-        export_format = st.radio("Select Export Format", ["CSV", "Excel", "JSON"], horizontal=True)
+        export_formats = ["CSV", "Excel", "JSON"]
+        if PYARROW_AVAILABLE:
+            # Arrow's C++ writer is an order of magnitude faster than the
+            # pure-Python openpyxl path for numeric frames
+            export_formats.insert(0, "Feather (fast)")
+        export_format = st.radio("Select Export Format", export_formats, horizontal=True)
         
         st.markdown("### Select Data to Export")
         export_ticks = st.checkbox("Raw Tick Data", value=True)
@@ -540,30 +778,36 @@ with tab4:
         if st.button("📥 Generate Export File", type="primary"):
             try:
                 export_data = {}
-                
+
+                # One fetch (and one resample) per symbol, shared by all
+                # of the sections below
+                df_a = df_b = None
+                ohlc_a = ohlc_b = None
+                if export_ticks or export_ohlc or export_analytics:
+                    df_a = _fetch_ticks(
+                        symbol_a, 10000,
+                        st.session_state.storage.get_last_timestamp(symbol_a),
+                    )
+                    df_b = _fetch_ticks(
+                        symbol_b, 10000,
+                        st.session_state.storage.get_last_timestamp(symbol_b),
+                    )
+                if (export_ohlc or export_analytics) and tick_count_a > 0 and tick_count_b > 0:
+                    ohlc_a = st.session_state.analytics.resample_ticks(df_a, timeframe)
+                    ohlc_b = st.session_state.analytics.resample_ticks(df_b, timeframe)
+
                 # Export ticks
                 if export_ticks:
-                    df_a = st.session_state.storage.get_latest_ticks(symbol_a, n=10000)
-                    df_b = st.session_state.storage.get_latest_ticks(symbol_b, n=10000)
                     export_data[f'{symbol_a}_ticks'] = df_a
                     export_data[f'{symbol_b}_ticks'] = df_b
-                
+
                 # Export OHLC
-                if export_ohlc and tick_count_a > 0 and tick_count_b > 0:
-                    df_a = st.session_state.storage.get_latest_ticks(symbol_a, n=10000)
-                    df_b = st.session_state.storage.get_latest_ticks(symbol_b, n=10000)
-                    ohlc_a = st.session_state.analytics.resample_ticks(df_a, timeframe)
-                    ohlc_b = st.session_state.analytics.resample_ticks(df_b, timeframe)
+                if export_ohlc and ohlc_a is not None:
                     export_data[f'{symbol_a}_ohlc'] = ohlc_a
                     export_data[f'{symbol_b}_ohlc'] = ohlc_b
-                
+
                 # Export analytics
-                if export_analytics and tick_count_a > 0 and tick_count_b > 0:
-                    df_a = st.session_state.storage.get_latest_ticks(symbol_a, n=10000)
-                    df_b = st.session_state.storage.get_latest_ticks(symbol_b, n=10000)
-                    ohlc_a = st.session_state.analytics.resample_ticks(df_a, timeframe)
-                    ohlc_b = st.session_state.analytics.resample_ticks(df_b, timeframe)
-                    
+                if export_analytics and ohlc_a is not None:
                     if len(ohlc_a) > rolling_window and len(ohlc_b) > rolling_window:
                         price_a = ohlc_a["close"]
                         price_b = ohlc_b["close"]
@@ -585,10 +829,32 @@ with tab4:
                 # Generate download button based on format
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 
-                if export_format == "CSV":
+                if export_format == "Feather (fast)":
+                    import zipfile
+                    from io import BytesIO
+                    bundle = BytesIO()
+                    # Feather with lz4 is already compressed; store as-is
+                    with zipfile.ZipFile(bundle, "w", zipfile.ZIP_STORED) as zf:
+                        for name, df in export_data.items():
+                            fbuf = BytesIO()
+                            pyarrow.feather.write_feather(
+                                pa.Table.from_pandas(df, preserve_index=True),
+                                fbuf,
+                                compression="lz4",
+                                chunksize=65536,
+                            )
+                            zf.writestr(f"{name}.feather", fbuf.getvalue())
+                    st.download_button(
+                        label="📥 Download Feather Bundle",
+                        data=bundle.getvalue(),
+                        file_name=f"gemscap_export_{timestamp}.zip",
+                        mime="application/zip"
+                    )
+
+                elif export_format == "CSV":
                     # Combine all dataframes
                     for name, df in export_data.items():
-                        csv = df.to_csv(index=True)
+                        csv = _df_to_csv_bytes(df)
                         st.download_button(
                             label=f"📥 Download {name}.csv",
                             data=csv,
@@ -611,14 +877,43 @@ with tab4:
                     )
                 
                 elif export_format == "JSON":
-                    json_data = {}
-                    for name, df in export_data.items():
-                        json_data[name] = df.to_json(orient='records', date_format='iso')
-                    
-                    import json
+                    if ORJSON_AVAILABLE:
+                        # Column-oriented layout serialized in one pass:
+                        # orjson writes the numpy columns directly, no
+                        # per-frame to_json string re-escaped by a second
+                        # json.dumps
+                        # Object columns (e.g. the tick frames' symbol
+                        # strings) are not serializable as numpy arrays,
+                        # so they go through tolist(); numeric/datetime
+                        # columns stay as arrays for the fast path
+                        payload = {
+                            name: {
+                                'columns': list(df.columns),
+                                'index': df.index.astype('int64').tolist(),
+                                'data': [
+                                    df[c].tolist()
+                                    if df[c].dtype == object
+                                    else df[c].to_numpy()
+                                    for c in df.columns
+                                ],
+                            }
+                            for name, df in export_data.items()
+                        }
+                        json_bytes = orjson.dumps(
+                            payload,
+                            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2,
+                        )
+                    else:
+                        json_data = {}
+                        for name, df in export_data.items():
+                            json_data[name] = df.to_json(orient='records', date_format='iso')
+
+                        import json
+                        json_bytes = json.dumps(json_data, indent=2)
+
                     st.download_button(
                         label="📥 Download JSON File",
-                        data=json.dumps(json_data, indent=2),
+                        data=json_bytes,
                         file_name=f"gemscap_export_{timestamp}.json",
                         mime="application/json"
                     )
@@ -649,5 +944,17 @@ st.markdown(
 )
 
 if auto_refresh:
-    time.sleep(0.5)
+    # Debounce: keep polling the cheap tick counter and only trigger a
+    # full rerun once new ticks actually arrived, so idle refresh cycles
+    # skip the whole analytics/render pipeline
+    for _ in range(20):
+        time.sleep(0.5)
+        current_count = (
+            st.session_state.storage.get_tick_count(symbol_a)
+            + st.session_state.storage.get_tick_count(symbol_b)
+        )
+        if current_count != st.session_state.get("last_seen_count", -1):
+            st.session_state.last_seen_count = current_count
+            st.rerun()
+    # Refresh the page periodically even without data so controls stay live
     st.rerun()
@@ -1,77 +1,252 @@
-﻿"""Real-time data ingestion from Binance Futures WebSocket."""
-import json
+"""Real-time data ingestion from Binance Futures WebSocket."""
 import threading
 import time
-from datetime import datetime
+from collections import deque
+import numpy as np
+import pandas as pd
 import websocket
 from storage import TickStorage
+from analytics import RollingPairState
+
+try:
+    # orjson parses trade messages several times faster than stdlib json;
+    # _on_message runs once per tick so this matters at high tick rates
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 class BinanceTickIngestion:
     def __init__(self, symbols, storage):
         self.symbols = [s.lower() for s in symbols]
         self.storage = storage
-        self.ws_connections = {}
+        self.ws = None
         self.running = False
         self.threads = []
-        self.tick_buffer = []
+        # deque.append is atomic under the GIL, so producers never take a
+        # lock per tick; the flusher swaps the whole deque out instead
+        self.tick_buffer = deque()
         self.buffer_lock = threading.Lock()
         self.stats = {symbol: {'count': 0, 'last_price': 0} for symbol in self.symbols}
-        self.stats_lock = threading.Lock()
-    
-    def _on_message(self, ws, message, symbol):
+        # Routing table keyed by the exchange's upper-case symbol so
+        # _on_message never has to call .lower() per tick
+        self._stats_by_upper = {
+            symbol.upper(): self.stats[symbol] for symbol in self.symbols
+        }
+
+    def _on_message(self, ws, message):
         try:
-            data = json.loads(message)
-            if data.get('e') == 'trade':
-                timestamp = datetime.fromtimestamp(data['T'] / 1000.0).isoformat()
-                price = float(data['p'])
-                quantity = float(data['q'])
-                with self.buffer_lock:
-                    self.tick_buffer.append((timestamp, symbol.upper(), price, quantity))
-                with self.stats_lock:
-                    self.stats[symbol]['count'] += 1
-                    self.stats[symbol]['last_price'] = price
+            # Combined-stream envelope: {'stream': ..., 'data': {...}}
+            payload = _json.loads(message).get('data')
+            if payload and payload.get('e') == 'trade':
+                symbol_upper = payload['s']
+                # Buffer the raw millisecond int and price/qty strings;
+                # batch conversion happens once per flush instead of per tick.
+                # Lock-free: a single deque append is atomic under the GIL.
+                self.tick_buffer.append(
+                    (payload['T'], symbol_upper, payload['p'], payload['q'])
+                )
+                # One stream thread writes all stats, so no lock needed
+                stats = self._stats_by_upper[symbol_upper]
+                stats['count'] += 1
+                stats['last_price'] = float(payload['p'])
         except:
             pass
-    
-    def _start_symbol_stream(self, symbol):
-        url = f"wss://fstream.binance.com/ws/{symbol}@trade"
-        ws = websocket.WebSocketApp(url, on_message=lambda ws, msg: self._on_message(ws, msg, symbol))
-        self.ws_connections[symbol] = ws
-        thread = threading.Thread(target=ws.run_forever, daemon=True)
+
+    def _start_stream(self):
+        # One combined stream for all symbols: a single TCP+TLS session
+        # and thread instead of one of each per symbol
+        streams = "/".join(f"{symbol}@trade" for symbol in self.symbols)
+        url = f"wss://fstream.binance.com/stream?streams={streams}"
+        self.ws = websocket.WebSocketApp(url, on_message=self._on_message)
+        thread = threading.Thread(target=self.ws.run_forever, daemon=True)
         thread.start()
         self.threads.append(thread)
-    
+
     def _flush_buffer(self):
         while self.running:
             time.sleep(1)
+            # Atomic swap: producers keep appending to the fresh deque
+            # while this thread drains the old one outside the lock
             with self.buffer_lock:
-                if self.tick_buffer:
-                    try:
-                        self.storage.insert_ticks_batch(self.tick_buffer.copy())
-                        self.tick_buffer.clear()
-                    except:
-                        pass
-    
+                batch, self.tick_buffer = self.tick_buffer, deque()
+            if batch:
+                try:
+                    if PYARROW_AVAILABLE:
+                        # Columnar handoff: one Arrow RecordBatch with
+                        # typed columns (prices/qtys cast from the raw
+                        # exchange strings in C) instead of a list of
+                        # Python tuples
+                        rb = pa.record_batch(
+                            [
+                                pa.array([t[0] for t in batch], type=pa.int64()),
+                                pa.array([t[1] for t in batch]),
+                                pa.array([t[2] for t in batch]).cast(pa.float64()),
+                                pa.array([t[3] for t in batch]).cast(pa.float64()),
+                            ],
+                            names=['timestamp_ms', 'symbol', 'price', 'quantity'],
+                        )
+                        self.storage.insert_arrow(rb)
+                    else:
+                        # Vectorized conversion of the whole batch: one
+                        # pd.to_datetime call instead of per-tick
+                        # datetime.fromtimestamp().isoformat()
+                        ts_iso = pd.to_datetime(
+                            [t[0] for t in batch], unit='ms'
+                        ).astype(str)
+                        prices = np.array([t[2] for t in batch], dtype=np.float64)
+                        qtys = np.array([t[3] for t in batch], dtype=np.float64)
+                        ticks = list(zip(
+                            ts_iso, (t[1] for t in batch), prices, qtys
+                        ))
+                        self.storage.insert_ticks_batch(ticks)
+                except:
+                    pass
+
     def start(self):
         if self.running:
             return
         self.running = True
-        for symbol in self.symbols:
-            self._start_symbol_stream(symbol)
+        self._start_stream()
         thread = threading.Thread(target=self._flush_buffer, daemon=True)
         thread.start()
-    
+
     def stop(self):
         self.running = False
-        for ws in self.ws_connections.values():
+        if self.ws is not None:
             try:
-                ws.close()
+                self.ws.close()
             except:
                 pass
-    
+
     def get_stats(self):
-        with self.stats_lock:
-            return self.stats.copy()
-    
+        # Snapshot without a lock: each inner dict is written by a single
+        # thread and dict reads are GIL-atomic
+        return {symbol: stats.copy() for symbol, stats in self.stats.items()}
+
     def is_running(self):
         return self.running
+
+
+class AnalyticsWorker:
+    """
+    Background pair-analytics loop.
+
+    Runs the resample/OLS/z-score pipeline in its own daemon thread at
+    roughly flush rate (1 Hz) and publishes the latest result snapshot
+    per pair configuration, so UI reruns only read and render instead of
+    blocking on the computation. Skips a cycle entirely when no new
+    ticks arrived since the last one.
+    """
+
+    def __init__(self, storage, analytics, interval=1.0):
+        self.storage = storage
+        self.analytics = analytics
+        self.interval = interval
+        self.running = False
+        self._config = None
+        self._states = {}
+        self._results = {}
+        self._results_lock = threading.RLock()
+        self._last_seen = None
+
+    def configure(self, symbol_a, symbol_b, timeframe, window, threshold):
+        """Point the worker at the pair currently shown in the UI"""
+        self._config = (symbol_a, symbol_b, timeframe, window, threshold)
+
+    def get_latest(self, key):
+        """Return the last published result dict for a pair key, if any"""
+        with self._results_lock:
+            return self._results.get(key)
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def _run(self):
+        while self.running:
+            time.sleep(self.interval)
+            config = self._config
+            if config is None:
+                continue
+            symbol_a, symbol_b, timeframe, window, threshold = config
+            last = (
+                self.storage.get_last_timestamp(symbol_a),
+                self.storage.get_last_timestamp(symbol_b),
+            )
+            if last == self._last_seen:
+                continue
+            self._last_seen = last
+            try:
+                result = self._compute(*config)
+            except Exception:
+                continue
+            if result is not None:
+                with self._results_lock:
+                    self._results[(symbol_a, symbol_b, timeframe, window)] = result
+
+    def _compute(self, symbol_a, symbol_b, timeframe, window, threshold):
+        df_a = self.storage.get_latest_ticks(symbol_a, n=5000)
+        df_b = self.storage.get_latest_ticks(symbol_b, n=5000)
+        if df_a.empty or df_b.empty:
+            return None
+
+        ohlc_a = self.analytics.resample_ticks(df_a, timeframe)
+        ohlc_b = self.analytics.resample_ticks(df_b, timeframe)
+        result = {
+            "ohlc_a": ohlc_a,
+            "ohlc_b": ohlc_b,
+            "ready": (
+                not ohlc_a.empty
+                and not ohlc_b.empty
+                and len(ohlc_a) > window
+            ),
+        }
+        if not result["ready"]:
+            return result
+
+        price_a = ohlc_a["close"]
+        price_b = ohlc_b["close"]
+        hedge_ratio, alpha, r_squared = self.analytics.calculate_ols_hedge_ratio(
+            price_a, price_b
+        )
+        state_key = (symbol_a, symbol_b, timeframe, window)
+        state = self._states.get(state_key)
+        if state is None:
+            state = RollingPairState(window)
+            self._states[state_key] = state
+
+        spread_arr, z_arr, corr_arr, pair_index = state.update(
+            price_a, price_b, hedge_ratio
+        )
+        last_z = (
+            float(z_arr[-1])
+            if z_arr.size and np.isfinite(z_arr[-1])
+            else None
+        )
+        result.update(
+            price_a=price_a,
+            price_b=price_b,
+            hedge_ratio=hedge_ratio,
+            alpha=alpha,
+            r_squared=r_squared,
+            spread=spread_arr,
+            zscore=z_arr,
+            pair_index=pair_index,
+            last_z=last_z,
+            alert_hit=last_z is not None and abs(last_z) > threshold,
+            correlation=corr_arr,
+            corr_index=pair_index,
+        )
+        return result
@@ -1,92 +1,826 @@
 ﻿"""Storage module for SQLite database operations."""
+import queue
+import re
 import sqlite3
+import time
+import numpy as np
 import pandas as pd
 import threading
 
+try:
+    # apsw wraps the SQLite C API much more thinly than stdlib sqlite3:
+    # no per-call type checking or binding copies, and statements are
+    # cached and reused across calls automatically. Both modules drive
+    # the same database file, so it is a drop-in speedup when installed
+    import apsw
+    APSW_AVAILABLE = True
+except ImportError:
+    APSW_AVAILABLE = False
+
+try:
+    # DuckDB can scan the SQLite file directly through its sqlite
+    # extension, running analytical queries in a vectorized columnar
+    # engine - far faster than row-at-a-time sqlite3 for big aggregates
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+# Capacity of the per-symbol in-memory ring buffers
+RING_CAPACITY = 200_000
+
+# Rows per multi-row INSERT statement for large batches (matches
+# SQLite's default SQLITE_MAX_COMPOUND_SELECT of 500)
+_INSERT_CHUNK = 500
+
+# Write-behind drain limits: the writer thread combines queued batches
+# into one transaction up to this many rows, waiting at most this long
+# for more work before committing what it has
+_WRITE_MAX_BATCH = 10_000
+_WRITE_MAX_WAIT = 0.005
+
+# Ticks per symbol pulled into the ring buffers at startup, so reads hit
+# the zero-per-row-cost array path from the first call
+_RING_WARMUP = 20_000
+
 class TickStorage:
     def __init__(self, db_path="ticks.db"):
         self.db_path = db_path
-        self._lock = threading.Lock()
+        # Per-symbol struct-of-arrays ring buffers: contiguous numpy
+        # columns instead of per-row Python objects, so the analytics
+        # kernels can consume them directly. Handoff is lock-free
+        # single-producer/single-consumer: the flush thread writes the
+        # arrays first and publishes (head, count) as one tuple store
+        # (atomic under the GIL); readers snapshot that tuple before
+        # slicing, so no lock is held on either side.
+        self._rings = {}
+        # One persistent writer connection plus lazily-created
+        # per-thread reader connections: WAL lets the readers run
+        # concurrently with the writer, and keeping them open avoids
+        # paying connect + pragma setup on every call. No Python lock
+        # anywhere: the writer connection is only ever touched from
+        # __init__ (before the writer thread starts) and then from the
+        # writer thread, and SQLite's own busy_timeout handles any
+        # out-of-process writer
+        self._writer_conn = None
+        self._tls = threading.local()
+        # Symbol set and per-symbol row counts change only on insert, so
+        # one GROUP BY scan at startup plus increments on the write path
+        # turn get_symbols/get_tick_count into dict reads
+        self._symbols_cache = set()
+        self._count_cache = {None: 0}
+        # Ticks are sharded into one table per symbol so each query
+        # walks a small per-symbol B-tree instead of one tree holding
+        # every symbol's rows. symbol -> table name, plus a cache of the
+        # per-table multi-row INSERT SQL
+        self._shard_tables = {}
+        self._chunk_sql = {}
+        # Per-symbol materialized 1s OHLC tables, maintained in the same
+        # transaction as the raw inserts (symbol -> table name)
+        self._ohlc_tables = {}
         self._init_db()
+        self._load_caches()
+        # Pre-warm the rings from SQLite: after this, the hot read paths
+        # (get_latest_ticks/get_latest_prices/get_ticks_window) are pure
+        # numpy slices with no per-row Python work, even in a fresh
+        # process that has not ingested anything yet
+        for symbol in self._symbols_cache:
+            ts_ns, prices, qtys = self._fetch_latest_sql(symbol, _RING_WARMUP)
+            if len(ts_ns):
+                self._ring_append(symbol, ts_ns, prices, qtys)
+        # Write-behind queue: producers hand their batches to one
+        # dedicated writer thread that drains and commits them in a
+        # single transaction per cycle, so callers never pay fsync
+        # latency. Readers see new ticks through the rings immediately;
+        # only SQLite durability lags by a few milliseconds
+        self._write_q = queue.SimpleQueue()
+        threading.Thread(target=self._writer_loop, daemon=True).start()
+
+    def _get_conn(self):
+        """Persistent read connection for the calling thread"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            # mode=ro: SQLite skips all write-lock and journal
+            # bookkeeping on these connections. Shared-cache mode was
+            # considered for pooling the page cache across readers, but
+            # it is deprecated and reintroduces table-level locks that
+            # would serialize readers against the writer under WAL; the
+            # 1 GiB mmap already shares hot pages between connections
+            # through the OS page cache
+            if APSW_AVAILABLE:
+                conn = apsw.Connection(
+                    self.db_path, flags=apsw.SQLITE_OPEN_READONLY
+                )
+            else:
+                conn = sqlite3.connect(f"file:{self.db_path}?mode=ro",
+                                       uri=True,
+                                       check_same_thread=False,
+                                       isolation_level=None,
+                                       cached_statements=128)
+            self._tls.conn = self._configure_conn(conn)
+        return self._tls.conn
+
+    def _get_writer(self):
+        """Writer connection; used only by __init__ and the writer thread"""
+        if self._writer_conn is None:
+            if APSW_AVAILABLE:
+                # apsw never opens implicit transactions, matching the
+                # explicit BEGIN IMMEDIATE discipline below
+                conn = apsw.Connection(self.db_path)
+            else:
+                # isolation_level=None disables the driver's implicit
+                # transaction management; transactions are opened
+                # explicitly with BEGIN IMMEDIATE below
+                conn = sqlite3.connect(self.db_path,
+                                       check_same_thread=False,
+                                       isolation_level=None,
+                                       cached_statements=128)
+            self._writer_conn = self._configure_conn(conn)
+        return self._writer_conn
+
+    def _ring_for(self, symbol):
+        ring = self._rings.get(symbol)
+        if ring is None:
+            # float32 halves memory traffic and is plenty for crypto
+            # prices; accumulations upcast to float64 where it matters
+            ring = {
+                'ts': np.empty(RING_CAPACITY, dtype=np.int64),
+                'price': np.empty(RING_CAPACITY, dtype=np.float32),
+                'qty': np.empty(RING_CAPACITY, dtype=np.float32),
+                # (head, count) published together after data is written
+                'state': (0, 0),
+            }
+            self._rings[symbol] = ring
+        return ring
+
+    def _ring_append(self, symbol, ts_ns, prices, qtys):
+        """Append tick arrays for one symbol into its ring buffer"""
+        ring = self._ring_for(symbol)
+        cap = RING_CAPACITY
+        n = len(ts_ns)
+        if n >= cap:
+            ts_ns, prices, qtys = ts_ns[-cap:], prices[-cap:], qtys[-cap:]
+            n = cap
+        head, count = ring['state']
+        idx = (head + np.arange(n)) % cap
+        ring['ts'][idx] = ts_ns
+        ring['price'][idx] = prices
+        ring['qty'][idx] = qtys
+        # Publish the new indices only after the data stores above, so a
+        # concurrent reader never sees indices pointing at unwritten slots
+        ring['state'] = ((head + n) % cap, min(count + n, cap))
+
+    def _fetch_latest_sql(self, symbol, n):
+        """
+        Latest n ticks straight from SQLite into numpy arrays.
+
+        Raw cursor + np.fromiter: no DataFrame, no block manager, no
+        pd.to_datetime - just the three typed arrays a numeric consumer
+        needs.
+        """
+        empty_f = np.empty(0, dtype=np.float64)
+        table = self._shard_tables.get(symbol)
+        if table is None:
+            return np.empty(0, dtype=np.int64), empty_f, empty_f
+        cursor = self._get_conn().cursor()
+        cursor.execute(
+            f"SELECT timestamp, price, quantity FROM {table}"
+            " ORDER BY timestamp DESC LIMIT ?",
+            (int(n),),
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return np.empty(0, dtype=np.int64), empty_f, empty_f
+        m = len(rows)
+        # DESC result: flip back to ascending in O(n)
+        ts = np.fromiter((r[0] for r in rows), dtype=np.int64, count=m)[::-1]
+        price = np.fromiter((r[1] for r in rows), dtype=np.float64, count=m)[::-1]
+        qty = np.fromiter((r[2] for r in rows), dtype=np.float64, count=m)[::-1]
+        return ts, price, qty
+
+    def get_latest_prices(self, symbol, n=1000):
+        """
+        Return the latest n ticks as bare numpy arrays, oldest first.
+
+        For indicator-style consumers that only need the numbers:
+        (ts_ns int64, price, qty) with no DataFrame construction at all.
+        Served as ring-buffer views when the ring is warm (float32
+        price/qty), raw-cursor SQLite arrays otherwise (float64).
+        """
+        ring = self._rings.get(symbol)
+        if ring is not None and ring['state'][1]:
+            return self.get_latest_arrays(symbol, n=n)
+        return self._fetch_latest_sql(symbol, n)
+
+    def get_latest_arrays(self, symbol, n=1000):
+        """
+        Return the latest n ticks for a symbol as numpy arrays.
+
+        Returns:
+            tuple: (ts_ns int64 array, price array, qty array), oldest
+            first. Views into the ring buffer when no wrap-around copy is
+            needed.
+        """
+        ring = self._rings.get(symbol)
+        head, ring_count = ring['state'] if ring is not None else (0, 0)
+        if ring is None or ring_count == 0:
+            # Ring is cold (e.g. fresh process); hydrate from SQLite
+            return self._fetch_latest_sql(symbol, n)
+
+        count = min(n, ring_count)
+        start = head - count
+        if start >= 0:
+            sl = slice(start, head)
+            return ring['ts'][sl], ring['price'][sl], ring['qty'][sl]
+        # Wrapped: stitch the two segments together
+        idx = (start + np.arange(count)) % RING_CAPACITY
+        return ring['ts'][idx], ring['price'][idx], ring['qty'][idx]
     
+    def _configure_conn(self, conn):
+        """
+        Apply the tuned PRAGMAs to a fresh connection.
+
+        WAL mode is persistent in the database file but the rest are
+        per-connection, so every connect goes through here. WAL +
+        synchronous=NORMAL moves fsync cost to checkpoint time and lets
+        readers proceed while the flush thread is committing.
+        """
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=1073741824")
+        # Negative cache_size is KiB: keep ~64 MiB of pages hot
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _table_for(self, symbol):
+        """Shard table name for a symbol (sanitized for SQL identifiers)"""
+        return "ticks_" + re.sub(r"[^A-Za-z0-9_]", "_", symbol)
+
+    def _ensure_table(self, cursor, symbol):
+        """
+        Create the per-symbol shard table and its index on first use.
+
+        Only called from __init__ and the writer thread, so no lock is
+        needed. timestamp is INTEGER nanoseconds since epoch:
+        fixed-width index comparisons and no ISO string parse on reads.
+        """
+        table = self._shard_tables.get(symbol)
+        if table is not None and symbol in self._ohlc_tables:
+            return table
+        table = self._table_for(symbol)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                price REAL NOT NULL,
+                quantity REAL NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # symbol is constant within a shard, so (timestamp, price,
+        # quantity) already covers the read query: index-only scans
+        # with no main-table row lookup per match
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{table}_ts_cover
+            ON {table}(timestamp, price, quantity)
+        """)
+        # Materialized 1s bars, upserted at ingest so chart queries read
+        # O(bars) aggregate rows instead of re-reducing O(ticks)
+        ohlc = "ohlc_1s_" + table[len('ticks_'):]
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {ohlc} (
+                bucket_ts INTEGER PRIMARY KEY,
+                open REAL NOT NULL,
+                high REAL NOT NULL,
+                low REAL NOT NULL,
+                close REAL NOT NULL,
+                volume REAL NOT NULL
+            )
+        """)
+        self._shard_tables[symbol] = table
+        self._ohlc_tables[symbol] = ohlc
+        return table
+
     def _init_db(self):
-        with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ticks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    symbol TEXT NOT NULL,
-                    price REAL NOT NULL,
-                    quantity REAL NOT NULL,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        # Runs before the writer thread starts, so the writer connection
+        # is safe to use here without coordination
+        conn = self._get_writer()
+        cursor = conn.cursor()
+        # Migrate databases from the old single-table layout: fix up
+        # TEXT timestamps to INTEGER ns if needed, then split the
+        # rows into per-symbol shard tables and drop the big table
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='ticks'"
+        )
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("PRAGMA table_info(ticks)")
+        ts_type = next(
+            (row[2] for row in cursor.fetchall() if row[1] == 'timestamp'),
+            '',
+        )
+        legacy_text = ts_type.upper() == 'TEXT'
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("SELECT DISTINCT symbol FROM ticks")
+        for (symbol,) in cursor.fetchall():
+            table = self._ensure_table(cursor, symbol)
+            if legacy_text:
+                # strftime only resolves whole seconds, so legacy
+                # rows keep second precision; rows written from
+                # here on are exact ns
+                cursor.execute(f"""
+                    INSERT INTO {table} (timestamp, symbol, price, quantity, created_at)
+                    SELECT CAST(strftime('%s', timestamp) AS INTEGER) * 1000000000,
+                           symbol, price, quantity, created_at
+                    FROM ticks WHERE symbol = ?
+                """, (symbol,))
+            else:
+                cursor.execute(f"""
+                    INSERT INTO {table} (timestamp, symbol, price, quantity, created_at)
+                    SELECT timestamp, symbol, price, quantity, created_at
+                    FROM ticks WHERE symbol = ?
+                """, (symbol,))
+        cursor.execute("DROP TABLE ticks")
+        cursor.execute("COMMIT")
+
+    def _load_caches(self):
+        cursor = self._get_conn().cursor()
+        cursor.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type='table' AND name LIKE 'ticks\\_%' ESCAPE '\\'"
+        )
+        tables = [row[0] for row in cursor.fetchall()]
+        for table in tables:
+            # Exchange symbols are alphanumeric, so the sanitized table
+            # suffix round-trips back to the symbol
+            symbol = table[len('ticks_'):]
+            self._shard_tables.setdefault(symbol, table)
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            count = cursor.fetchone()[0]
+            if count:
+                self._symbols_cache.add(symbol)
+                self._count_cache[symbol] = count
+                self._count_cache[None] += count
+
+    def _update_caches(self, symbols, counts):
+        """Fold freshly inserted rows into the symbol/count caches"""
+        for symbol, count in zip(symbols, counts):
+            self._symbols_cache.add(symbol)
+            self._count_cache[symbol] = self._count_cache.get(symbol, 0) + int(count)
+            self._count_cache[None] += int(count)
+
+    def _write_rows(self, cursor, table, ts_l, sym_l, price_l, qty_l):
+        """Insert one symbol's column lists into its shard table"""
+        single_sql = (
+            f"INSERT INTO {table} (timestamp, symbol, price, quantity)"
+            " VALUES (?, ?, ?, ?)"
+        )
+        n = len(ts_l)
+        if n > _INSERT_CHUNK:
+            # Multi-row VALUES amortizes sqlite3's per-statement
+            # dispatch across 500 rows at a time. Full chunks share one
+            # constant SQL string per table, so the prepared statement
+            # is reused from the connection's cache
+            chunk_sql = self._chunk_sql.get(table)
+            if chunk_sql is None:
+                chunk_sql = (
+                    f"INSERT INTO {table} (timestamp, symbol, price, quantity) VALUES "
+                    + ",".join(["(?, ?, ?, ?)"] * _INSERT_CHUNK)
                 )
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_symbol_timestamp 
-                ON ticks(symbol, timestamp)
-            """)
-            conn.commit()
-            conn.close()
-    
+                self._chunk_sql[table] = chunk_sql
+            params = [None] * (4 * _INSERT_CHUNK)
+            for start in range(0, n - n % _INSERT_CHUNK, _INSERT_CHUNK):
+                stop = start + _INSERT_CHUNK
+                params[0::4] = ts_l[start:stop]
+                params[1::4] = sym_l[start:stop]
+                params[2::4] = price_l[start:stop]
+                params[3::4] = qty_l[start:stop]
+                cursor.execute(chunk_sql, params)
+            rest = n % _INSERT_CHUNK
+            if rest:
+                cursor.executemany(
+                    single_sql,
+                    zip(ts_l[-rest:], sym_l[-rest:],
+                        price_l[-rest:], qty_l[-rest:])
+                )
+        else:
+            cursor.executemany(single_sql, zip(ts_l, sym_l, price_l, qty_l))
+
+    def _insert_columns(self, ts_ns, symbols, prices, qtys):
+        """Feed the rings and queue one batch of column arrays for SQLite"""
+        uniq, counts = np.unique(symbols, return_counts=True)
+        per_symbol = []
+        for symbol in uniq:
+            mask = symbols == symbol
+            t, p, q = ts_ns[mask], prices[mask], qtys[mask]
+            self._ring_append(symbol, t, p, q)
+            per_symbol.append((
+                symbol, t.tolist(), symbols[mask].tolist(),
+                p.tolist(), q.tolist(), self._ohlc_rows(t, p, q),
+            ))
+        # Non-blocking handoff: the writer thread owns the transaction
+        # and its commit/fsync, so this returns as soon as the rings are
+        # published
+        self._write_q.put((per_symbol, uniq.tolist(), counts))
+
+    @staticmethod
+    def _ohlc_rows(ts_ns, prices, qtys):
+        """Reduce one symbol's batch arrays to 1s OHLCV upsert rows"""
+        buckets = ts_ns // 1_000_000_000
+        uniq_b, starts = np.unique(buckets, return_index=True)
+        ends = np.append(starts[1:], len(buckets))
+        return list(zip(
+            (uniq_b * 1_000_000_000).tolist(),
+            prices[starts].tolist(),
+            np.maximum.reduceat(prices, starts).tolist(),
+            np.minimum.reduceat(prices, starts).tolist(),
+            prices[ends - 1].tolist(),
+            np.add.reduceat(qtys, starts).tolist(),
+        ))
+
+    def _writer_loop(self):
+        while True:
+            batches = [self._write_q.get()]
+            rows = sum(len(entry[1]) for entry in batches[0][0])
+            # Drain briefly so bursts of small batches share one commit:
+            # fsync cost is amortized across everything queued within
+            # the wait window, up to the row cap
+            deadline = time.monotonic() + _WRITE_MAX_WAIT
+            while rows < _WRITE_MAX_BATCH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._write_q.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                batches.append(item)
+                rows += sum(len(entry[1]) for entry in item[0])
+            # No Python lock here: this thread is the only in-process
+            # writer, and SQLite's busy_timeout covers any contention
+            # with out-of-process writers at the file-lock level
+            cursor = self._get_writer().cursor()
+            try:
+                # One explicit transaction per drain cycle: BEGIN
+                # IMMEDIATE takes SQLite's write lock up front, and the
+                # whole cycle costs a single commit even when it spans
+                # several batches and shard tables
+                cursor.execute("BEGIN IMMEDIATE")
+                for per_symbol, _, _ in batches:
+                    for (symbol, ts_l, sym_l, price_l, qty_l,
+                         ohlc_rows) in per_symbol:
+                        table = self._ensure_table(cursor, symbol)
+                        self._write_rows(cursor, table, ts_l, sym_l,
+                                         price_l, qty_l)
+                        # Fold the batch's bars into the materialized
+                        # 1s OHLC table inside the same transaction,
+                        # so aggregates never drift from the raw rows
+                        cursor.executemany(
+                            f"INSERT INTO {self._ohlc_tables[symbol]}"
+                            " (bucket_ts, open, high, low, close, volume)"
+                            " VALUES (?, ?, ?, ?, ?, ?)"
+                            " ON CONFLICT(bucket_ts) DO UPDATE SET"
+                            " high = max(high, excluded.high),"
+                            " low = min(low, excluded.low),"
+                            " close = excluded.close,"
+                            " volume = volume + excluded.volume",
+                            ohlc_rows,
+                        )
+                cursor.execute("COMMIT")
+            except Exception:
+                # A bad batch must not kill the writer thread; drop
+                # the cycle and keep draining
+                try:
+                    cursor.execute("ROLLBACK")
+                except Exception:
+                    pass
+                continue
+            for _, uniq, counts in batches:
+                self._update_caches(uniq, counts)
+
     def insert_ticks_batch(self, ticks):
+        if isinstance(ticks, pd.DataFrame):
+            # Columnar fast path: pull typed arrays straight out of the
+            # frame instead of boxing every field through per-row tuples
+            if ticks.empty:
+                return
+            ts_ns = pd.to_datetime(ticks['timestamp']).values.view('i8')
+            self._insert_columns(
+                ts_ns,
+                ticks['symbol'].to_numpy(),
+                ticks['price'].to_numpy(dtype=np.float64),
+                ticks['quantity'].to_numpy(dtype=np.float64),
+            )
+            return
         if not ticks:
             return
-        with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.executemany(
-                "INSERT INTO ticks (timestamp, symbol, price, quantity) VALUES (?, ?, ?, ?)",
-                ticks
-            )
-            conn.commit()
-            conn.close()
+        ts_ns = pd.to_datetime([t[0] for t in ticks]).values.view('i8')
+        symbols = np.array([t[1] for t in ticks])
+        prices = np.array([t[2] for t in ticks], dtype=np.float64)
+        qtys = np.array([t[3] for t in ticks], dtype=np.float64)
+        self._insert_columns(ts_ns, symbols, prices, qtys)
     
+    def insert_ticks_stream(self, ticks_iter, batch_size=1000):
+        """
+        Insert ticks from an iterable, one transaction per batch_size
+        rows, so callers streaming singletons still get batched commits.
+        """
+        batch = []
+        for tick in ticks_iter:
+            batch.append(tick)
+            if len(batch) >= batch_size:
+                self.insert_ticks_batch(batch)
+                batch = []
+        if batch:
+            self.insert_ticks_batch(batch)
+
+    def insert_arrow(self, batch):
+        """
+        Insert an Arrow RecordBatch of ticks with columns
+        (timestamp_ms int64, symbol, price float64, quantity float64).
+
+        The columns come out of Arrow as numpy arrays with no per-row
+        Python objects, so the ring buffers are fed directly and only
+        the SQLite rows themselves are materialized.
+        """
+        if batch.num_rows == 0:
+            return
+        ts_ns = batch.column('timestamp_ms').to_numpy() * 1_000_000
+        symbols = batch.column('symbol').to_numpy(zero_copy_only=False)
+        prices = batch.column('price').to_numpy()
+        qtys = batch.column('quantity').to_numpy()
+        self._insert_columns(ts_ns, symbols, prices, qtys)
+
     def get_ticks(self, symbol=None, limit=None, start_time=None, end_time=None):
-        with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            query = "SELECT timestamp, symbol, price, quantity FROM ticks WHERE 1=1"
-            params = []
-            if symbol:
-                query += " AND symbol = ?"
-                params.append(symbol)
-            if start_time:
-                query += " AND timestamp >= ?"
-                params.append(start_time)
-            if end_time:
-                query += " AND timestamp <= ?"
-                params.append(end_time)
-            query += " ORDER BY timestamp DESC"
-            if limit:
-                query += f" LIMIT {limit}"
-            df = pd.read_sql_query(query, conn, params=params)
-            conn.close()
-            if not df.empty:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df = df.sort_values('timestamp')
-            return df
+        # Membership test on the cached symbol set: a query for a symbol
+        # we have never stored returns without opening a connection or
+        # probing any index
+        if symbol and symbol not in self._symbols_cache:
+            return pd.DataFrame(
+                columns=['timestamp', 'symbol', 'price', 'quantity']
+            )
+        # Reads take no lock: each thread has its own connection and WAL
+        # lets them run concurrently with the writer
+        conn = self._get_conn()
+        where = ""
+        params = []
+        if start_time:
+            where += " AND timestamp >= ?"
+            params.append(int(pd.Timestamp(start_time).value))
+        if end_time:
+            where += " AND timestamp <= ?"
+            params.append(int(pd.Timestamp(end_time).value))
+        if symbol:
+            # Single-shard query; symbol is implied by the table, so
+            # selecting only the three data columns keeps the scan
+            # entirely inside the covering index
+            table = self._shard_tables.get(symbol)
+            if table is None:
+                return pd.DataFrame(
+                    columns=['timestamp', 'symbol', 'price', 'quantity']
+                )
+            query = (
+                f"SELECT timestamp, price, quantity FROM {table} WHERE 1=1"
+                + where
+            )
+        else:
+            tables = sorted(self._shard_tables.values())
+            if not tables:
+                return pd.DataFrame(
+                    columns=['timestamp', 'symbol', 'price', 'quantity']
+                )
+            # Cross-symbol read: UNION ALL over the shards; ORDER BY /
+            # LIMIT below apply to the whole compound statement
+            query = " UNION ALL ".join(
+                f"SELECT timestamp, symbol, price, quantity FROM {t} WHERE 1=1{where}"
+                for t in tables
+            )
+            params = params * len(tables)
+        if limit:
+            # Backward index scan takes the newest rows; reversing the
+            # already-sorted result is O(n), no second sort. LIMIT is a
+            # bound parameter so the SQL text stays constant and hits
+            # the connection's prepared-statement cache
+            query += " ORDER BY timestamp DESC LIMIT ?"
+            params.append(int(limit))
+        else:
+            # Without a limit the index scan can deliver ascending order
+            # directly and no Python-side reordering is needed at all
+            query += " ORDER BY timestamp ASC"
+        # Raw cursor + typed column arrays: pd.read_sql_query builds the
+        # frame through per-row Python object inference, which is the
+        # slow path for a fixed-width result
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        if not rows:
+            return pd.DataFrame(
+                columns=['timestamp', 'symbol', 'price', 'quantity']
+            )
+        n = len(rows)
+        ts = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+        if symbol:
+            sym = np.full(n, symbol, dtype=object)
+            price = np.fromiter((r[1] for r in rows), dtype=np.float64, count=n)
+            qty = np.fromiter((r[2] for r in rows), dtype=np.float64, count=n)
+        else:
+            sym = np.array([r[1] for r in rows], dtype=object)
+            price = np.fromiter((r[2] for r in rows), dtype=np.float64, count=n)
+            qty = np.fromiter((r[3] for r in rows), dtype=np.float64, count=n)
+        if limit:
+            # DESC result: flip each column back to ascending in O(n)
+            ts, sym, price, qty = ts[::-1], sym[::-1], price[::-1], qty[::-1]
+        return pd.DataFrame({
+            # Integer ns: the datetime conversion is a view, not a parse
+            'timestamp': pd.to_datetime(ts, unit='ns'),
+            'symbol': sym,
+            'price': price,
+            'quantity': qty,
+        })
     
     def get_latest_ticks(self, symbol, n=1000):
+        ring = self._rings.get(symbol)
+        if ring is not None and ring['state'][1]:
+            # Warm ring: build the frame straight from the typed arrays
+            # (int64 ns timestamps, float32 price/qty) - no SQLite read,
+            # no ISO string parsing, half the column memory of float64
+            ts_ns, prices, qtys = self.get_latest_arrays(symbol, n=n)
+            return pd.DataFrame({
+                'timestamp': pd.to_datetime(ts_ns),
+                'symbol': symbol,
+                # copies so the frame is a stable snapshot even while the
+                # flush thread keeps writing into the ring
+                'price': prices.copy(),
+                'quantity': qtys.copy(),
+            })
         return self.get_ticks(symbol=symbol, limit=n)
     
+    def get_ticks_window(self, symbol, start_time=None, end_time=None):
+        """
+        Time-range query served from the in-memory ring buffer.
+
+        Bounds are located with np.searchsorted on the sorted timestamp
+        array - pointer arithmetic instead of a SQL range scan. Falls
+        back to the SQLite path when the ring is cold or does not reach
+        back far enough to cover start_time.
+        """
+        ring = self._rings.get(symbol)
+        if ring is not None and ring['state'][1]:
+            ts_ns, prices, qtys = self.get_latest_arrays(symbol, n=RING_CAPACITY)
+            start_ns = None
+            if start_time is not None:
+                start_ns = int(pd.Timestamp(start_time).value)
+            if start_ns is None or start_ns >= ts_ns[0]:
+                lo = 0
+                if start_ns is not None:
+                    lo = int(np.searchsorted(ts_ns, start_ns, side='left'))
+                hi = len(ts_ns)
+                if end_time is not None:
+                    end_ns = int(pd.Timestamp(end_time).value)
+                    hi = int(np.searchsorted(ts_ns, end_ns, side='right'))
+                return pd.DataFrame({
+                    'timestamp': pd.to_datetime(ts_ns[lo:hi]),
+                    'symbol': symbol,
+                    'price': prices[lo:hi].copy(),
+                    'quantity': qtys[lo:hi].copy(),
+                })
+        return self.get_ticks(
+            symbol=symbol, start_time=start_time, end_time=end_time
+        )
+
+    def get_ohlc(self, symbol, timeframe='1s', limit=None):
+        """
+        Read OHLC bars from the materialized per-symbol 1s table.
+
+        The bars are maintained at ingest time in the same transaction
+        as the raw rows, so this is O(bars) regardless of how many ticks
+        back the window reaches. Coarser timeframes are built by
+        reducing the stored 1s bars, still never touching raw ticks.
+        Only covers ticks ingested since the table was introduced.
+
+        Returns:
+            DataFrame with open/high/low/close/volume columns and a
+            DatetimeIndex, matching resample_ticks output.
+        """
+        empty = pd.DataFrame(
+            columns=['open', 'high', 'low', 'close', 'volume']
+        )
+        ohlc = self._ohlc_tables.get(symbol)
+        if ohlc is None:
+            return empty
+        bar_ns = pd.Timedelta(timeframe).value
+        factor = max(1, bar_ns // 1_000_000_000)
+        query = f"SELECT bucket_ts, open, high, low, close, volume FROM {ohlc}"
+        params = []
+        if limit:
+            # Fetch enough 1s bars to fill `limit` coarse bars
+            query += " ORDER BY bucket_ts DESC LIMIT ?"
+            params.append(int(limit) * int(factor))
+        else:
+            query += " ORDER BY bucket_ts ASC"
+        cursor = self._get_conn().cursor()
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        if not rows:
+            return empty
+        n = len(rows)
+        ts = np.fromiter((r[0] for r in rows), dtype=np.int64, count=n)
+        o = np.fromiter((r[1] for r in rows), dtype=np.float64, count=n)
+        h = np.fromiter((r[2] for r in rows), dtype=np.float64, count=n)
+        l = np.fromiter((r[3] for r in rows), dtype=np.float64, count=n)
+        c = np.fromiter((r[4] for r in rows), dtype=np.float64, count=n)
+        v = np.fromiter((r[5] for r in rows), dtype=np.float64, count=n)
+        if limit:
+            ts, o, h, l, c, v = ts[::-1], o[::-1], h[::-1], l[::-1], c[::-1], v[::-1]
+        if factor > 1:
+            # Reduce the 1s bars into the coarser timeframe
+            buckets = ts // bar_ns
+            uniq_b, starts = np.unique(buckets, return_index=True)
+            ends = np.append(starts[1:], n)
+            ts = uniq_b * bar_ns
+            o = o[starts]
+            h = np.maximum.reduceat(h, starts)
+            l = np.minimum.reduceat(l, starts)
+            c = c[ends - 1]
+            v = np.add.reduceat(v, starts)
+            if limit and len(ts) > limit:
+                sl = slice(-int(limit), None)
+                ts, o, h, l, c, v = ts[sl], o[sl], h[sl], l[sl], c[sl], v[sl]
+        return pd.DataFrame(
+            {'open': o, 'high': h, 'low': l, 'close': c, 'volume': v},
+            index=pd.to_datetime(ts),
+        )
+
+    def get_last_timestamp(self, symbol):
+        """
+        Return the newest tick timestamp (ns since epoch) for a symbol.
+
+        Served from the in-memory ring when warm - a couple of dict/array
+        reads - so it is cheap enough to use as a cache key every rerun.
+        Returns 0 when no ticks exist.
+        """
+        ring = self._rings.get(symbol)
+        if ring is not None:
+            head, count = ring['state']
+            if count:
+                return int(ring['ts'][(head - 1) % RING_CAPACITY])
+        table = self._shard_tables.get(symbol)
+        if table is None:
+            return 0
+        cursor = self._get_conn().cursor()
+        cursor.execute(f"SELECT MAX(timestamp) FROM {table}")
+        row = cursor.fetchone()
+        if row is None or row[0] is None:
+            return 0
+        return int(row[0])
+
+    def get_ticks_analytical(self, sql_where="1=1", columns="*"):
+        """
+        Run an analytical scan over all ticks with DuckDB.
+
+        Attaches the SQLite file through DuckDB's sqlite extension and
+        exposes the shard tables as one unified `ticks` relation
+        (timestamp, symbol, price, quantity), then executes
+        SELECT {columns} FROM ticks WHERE {sql_where} in DuckDB's
+        vectorized columnar engine. Orders of magnitude faster than the
+        sqlite3 row-store path for aggregations over millions of rows.
+        Requires the optional duckdb dependency.
+
+        Returns:
+            DataFrame with the query result.
+        """
+        if not DUCKDB_AVAILABLE:
+            raise RuntimeError(
+                "duckdb is required for get_ticks_analytical"
+            )
+        con = duckdb.connect()
+        try:
+            con.execute("INSTALL sqlite; LOAD sqlite;")
+            con.execute(f"ATTACH '{self.db_path}' AS s (TYPE sqlite)")
+            tables = sorted(self._shard_tables.values())
+            if not tables:
+                return pd.DataFrame(
+                    columns=['timestamp', 'symbol', 'price', 'quantity']
+                )
+            union = " UNION ALL ".join(
+                f"SELECT timestamp, symbol, price, quantity FROM s.{t}"
+                for t in tables
+            )
+            con.execute(f"CREATE VIEW ticks AS {union}")
+            return con.execute(
+                f"SELECT {columns} FROM ticks WHERE {sql_where}"
+            ).df()
+        finally:
+            con.close()
+
     def get_tick_count(self, symbol=None):
-        with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            if symbol:
-                cursor.execute("SELECT COUNT(*) FROM ticks WHERE symbol = ?", (symbol,))
-            else:
-                cursor.execute("SELECT COUNT(*) FROM ticks")
-            count = cursor.fetchone()[0]
-            conn.close()
-            return count
-    
+        # Maintained on the write path; a dict read instead of COUNT(*)
+        return self._count_cache.get(symbol, 0)
+
     def get_symbols(self):
-        with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT DISTINCT symbol FROM ticks")
-            symbols = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            return symbols
+        # Maintained on the write path; no DISTINCT scan
+        return sorted(self._symbols_cache)